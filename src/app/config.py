@@ -25,6 +25,17 @@ def get_api_secret() -> str:
     return os.environ.get("API_SECRET", "secret_key")
 
 
+@lru_cache
+def get_api_secret_bytes() -> bytes:
+    """
+    Get the API secret encoded as bytes, for comparing against request tokens.
+
+    Returns:
+        The API secret bytes.
+    """
+    return get_api_secret().encode()
+
+
 # API route configuration
 API_PREFIX = "/api"
 API_ROUTES = [
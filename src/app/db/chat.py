@@ -12,7 +12,7 @@ from botocore.exceptions import ClientError
 
 from app.custom_logger import get_logger
 from app.db.db import chats_table
-from app.models.chat import Chat, ChatListResponse, Message, Stream, Vote
+from app.models.chat import Chat, ChatListPayload, Message, Stream, Vote
 
 # Configure logging
 logger = get_logger("db.chat")
@@ -70,10 +70,21 @@ def delete_chat_by_id(chat_id: str) -> None:
         raise RuntimeError("Could not delete chat from database") from err
 
 
+def _chat_item_to_wire(item: dict[str, Any]) -> dict[str, Any]:
+    """Map a chat item to its camelCase wire representation."""
+    return {
+        "id": item["chat_id"],
+        "userId": item["user_id"],
+        "createdAt": item["chat_created_at"],
+        "title": item["title"],
+        "visibility": item["visibility"],
+    }
+
+
 def get_chats_by_user_id(
     user_id: str, limit: int, starting_after: str | None = None, ending_before: str | None = None
-) -> ChatListResponse:
-    """Paginate chats for a user."""
+) -> ChatListPayload:
+    """Paginate chats for a user, returning the wire payload directly."""
     idx = "GSI1-ChatsByUser"
     extended_limit = limit + 1
 
@@ -108,8 +119,8 @@ def get_chats_by_user_id(
 
         items = resp.get("Items", [])
         has_more = len(items) > limit
-        chats = [Chat.model_validate(item) for item in items[:limit]]
-        return ChatListResponse(chats=chats, has_more=has_more)
+        chats = [_chat_item_to_wire(item) for item in items[:limit]]
+        return {"chats": chats, "hasMore": has_more}
     except ClientError as err:
         logger.error("Failed to get chats for user %s: %s", user_id, err)
         raise RuntimeError("Could not get chats from database") from err
@@ -14,7 +14,7 @@ logger = get_logger("db")
 # Initialize DynamoDB resource and tables
 # Use local DynamoDB when DYNAMODB_URL is set
 dynamodb_url = os.environ.get("DYNAMODB_URL")
-logger.info(f"DynamoDB URL: {dynamodb_url}")
+logger.info("DynamoDB URL: %s", dynamodb_url)
 if dynamodb_url:
     # For local DynamoDB, we need to specify a region (any region works)
     dynamodb = boto3.resource("dynamodb", endpoint_url=dynamodb_url, region_name="us-east-1")
@@ -44,6 +44,7 @@ from fastapi import FastAPI
 from app.custom_logger import get_logger
 from app.middleware.auth import auth_middleware
 from app.routes import chat, health, quiz, title, user
+from app.utils import handle_unexpected_error
 
 # Configure logging
 logger = get_logger("app")
@@ -59,6 +60,9 @@ app = FastAPI(
 app.middleware("http")(auth_middleware)
 # app.middleware("http")(log_requests)
 
+# Return a 500 response for any error a route does not handle itself
+app.add_exception_handler(Exception, handle_unexpected_error)
+
 # Include routers
 app.include_router(chat.router)
 app.include_router(title.router)
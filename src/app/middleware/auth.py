@@ -8,8 +8,7 @@ from collections.abc import Awaitable, Callable
 
 from fastapi import Request, Response
 
-from app.config import API_PREFIX
-from app.utils import create_error_response, verify_api_key
+from app.utils import handle_auth_error, is_api_route, verify_api_key
 
 
 async def auth_middleware(request: Request, call_next: Callable[[Request], Awaitable[Response]]) -> Response:
@@ -24,9 +23,9 @@ async def auth_middleware(request: Request, call_next: Callable[[Request], Await
         The response from the next middleware or route handler.
     """
     # Only check authentication for API routes
-    if request.url.path.startswith(API_PREFIX):
+    if is_api_route(request.url.path):
         is_authenticated = await verify_api_key(request)
         if not is_authenticated:
-            return create_error_response(status_code=401, message="Invalid or missing API key")
+            return handle_auth_error()
 
     return await call_next(request)
@@ -4,7 +4,7 @@ Chat-related data models.
 This module contains models for chat messages and requests.
 """
 
-from typing import Any, Literal
+from typing import Any, Literal, TypedDict
 
 from pydantic import Field
 
@@ -123,6 +123,13 @@ class ChatListResponse(SnakeOrAliasModel):
     has_more: bool = Field(default=False, alias="hasMore")
 
 
+class ChatListPayload(TypedDict):
+    """Wire payload for the paginated chat list, built without a Pydantic round trip."""
+
+    chats: list[dict[str, Any]]
+    hasMore: bool
+
+
 class MessageCountResponse(SnakeOrAliasModel):
     """Response model for message count."""
 
@@ -5,7 +5,7 @@ This module defines the interface that all LLM providers must implement
 to be compatible with the chatbot backend.
 """
 
-from collections.abc import Iterator
+from collections.abc import AsyncIterator
 from typing import Any, Protocol, runtime_checkable
 
 
@@ -45,10 +45,12 @@ class LLMProvider(Protocol):
         system_message: str | None = None,
         model: str | None = None,
         tool_definitions: list[dict[str, Any]] | None = None,
-    ) -> Iterator[str | dict[str, Any]]:
+    ) -> AsyncIterator[str | bytes | dict[str, Any]]:
         """
         Stream a chat response from the provider.
 
+        Implementations are async generators so streaming never blocks the event loop.
+
         Args:
             messages: The formatted messages.
             system_message: Optional system message to prepend.
@@ -57,7 +59,7 @@ class LLMProvider(Protocol):
 
         Yields:
             Text chunks from the provider's API, or dictionaries with usage information.
-            Text chunks are returned as strings.
+            Text chunks are returned as strings, or as bytes already encoded as data stream frames.
             Usage information is returned as a dictionary with the following format:
             {"usage": {"promptTokens": int, "completionTokens": int}}
         """
@@ -9,6 +9,7 @@ import os
 
 from app.providers.base import LLMProvider
 from app.providers.openai import OpenAIProvider
+from app.providers.test import TestProvider, is_test_prompt, test_provider
 
 # Global provider cache
 _providers: dict[str, LLMProvider] = {}
@@ -50,3 +51,19 @@ def get_provider(provider_name: str | None = None) -> LLMProvider:
 
 # Pre-initialize the default provider
 default_provider = get_provider()
+
+# Providers indexed by is_test_prompt(), so selection is a single tuple lookup
+_PROVIDERS_BY_TEST_FLAG = (default_provider, test_provider)
+
+
+def get_provider_for_message(message_text: str | None) -> LLMProvider | TestProvider:
+    """
+    Get the provider that should answer a message.
+
+    Args:
+        message_text: The text of the latest user message, if any.
+
+    Returns:
+        The test provider for test prompts, the default provider otherwise.
+    """
+    return _PROVIDERS_BY_TEST_FLAG[message_text is not None and is_test_prompt(message_text)]
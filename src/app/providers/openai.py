@@ -6,11 +6,17 @@ and all OpenAI-specific configuration.
 """
 
 import os
-from collections.abc import Iterator
+from collections.abc import AsyncIterator, Iterator
 from functools import lru_cache
 from typing import Any
 
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
+from openai.types.responses import (
+    ResponseCompletedEvent,
+    ResponseFailedEvent,
+    ResponseIncompleteEvent,
+    ResponseTextDeltaEvent,
+)
 
 from app.custom_logger import get_logger
 
@@ -21,30 +27,40 @@ DEFAULT_MODEL = "gpt-4o-mini"
 logger = get_logger("openai")
 
 
-@lru_cache
-def get_openai_api_key() -> str:
+@lru_cache(maxsize=8)
+def _system_entry(system_message: str) -> dict[str, str]:
     """
-    Get the OpenAI API key from environment variables.
+    Get the input entry for a system message.
 
-    Returns:
-        The OpenAI API key.
+    The prompts are module constants, so each entry is built once and shared between
+    requests. Callers must not mutate the returned dict.
     """
-    return os.environ.get("OPENAI_API_KEY", "")
+    return {"role": "system", "content": system_message}
 
 
 class OpenAIProvider:
     """OpenAI implementation of the LLM provider interface."""
 
+    def __init__(self) -> None:
+        """
+        Resolve the API key and create the OpenAI clients once per provider.
+
+        The provider factory caches instances, so this runs once per process
+        and no environment lookup or client construction happens per request.
+        Streaming uses the async client so it never blocks the event loop.
+        """
+        self._api_key = os.environ.get("OPENAI_API_KEY", "")
+        self._client = OpenAI(api_key=self._api_key)
+        self._async_client = AsyncOpenAI(api_key=self._api_key)
+
     def get_client(self) -> OpenAI:
         """
-        Get an OpenAI client instance.
+        Get the OpenAI client instance.
 
         Returns:
-            An OpenAI client configured with the API key.
+            The OpenAI client configured with the API key.
         """
-        return OpenAI(
-            api_key=get_openai_api_key(),
-        )
+        return self._client
 
     def format_messages_from_request(self, request: Any) -> list[dict[str, Any]]:
         """
@@ -56,23 +72,29 @@ class OpenAIProvider:
         Returns:
             A list of formatted messages compatible with the OpenAI API.
         """
-        formatted_messages = []
+        return list(self._iter_messages(request))
+
+    def _iter_messages(self, request: Any) -> Iterator[dict[str, Any]]:
+        """
+        Yield OpenAI input messages for each message in the request.
 
-        # Add the messages from the request
+        Args:
+            request: The request object containing messages and other data.
+
+        Yields:
+            A message dict with the role and the combined text parts as content.
+        """
         for message in request.messages:
             # Combine all text parts into a single content string
-            content = "".join(part.text for part in message.parts if part.type == "text")
-            formatted_messages.append({"role": message.role, "content": content})
+            yield {"role": message.role, "content": "".join(part.text for part in message.parts if part.type == "text")}
 
-        return formatted_messages
-
-    def stream_chat_response(
+    async def stream_chat_response(
         self,
         messages: list[dict],
         system_message: str | None = None,
         model: str | None = None,
         tool_definitions: list[dict[str, Any]] | None = None,
-    ) -> Iterator[str | dict]:
+    ) -> AsyncIterator[str | dict]:
         """
         Stream a chat response from OpenAI.
 
@@ -88,29 +110,20 @@ class OpenAIProvider:
             Usage information is returned as a dictionary with the following format:
             {"usage": {"promptTokens": int, "completionTokens": int, "totalTokens": int}}
         """
-        # Get a client instance
-        client = self.get_client()
+        client = self._async_client
 
         if not tool_definitions:
             tool_definitions = []
         if model is None:
             model = DEFAULT_MODEL
 
-        # Prepend system message if provided
-        if system_message:
-            # Check if there's already a system message at the beginning
-            has_system_message = False
-            if messages and messages[0].get("role") == "system":
-                has_system_message = True
-
-            # Only add system message if there isn't one already
-            if not has_system_message:
-                system_msg = {"role": "system", "content": system_message}
-                messages = [system_msg, *messages]
+        # Prepend system message if provided and there isn't one at the beginning already
+        if system_message and not (messages and messages[0].get("role") == "system"):
+            messages = [_system_entry(system_message), *messages]
 
         # Create a streaming response using the responses endpoint
         # Note: We use Any for types with the OpenAI API to keep code simple
-        stream = client.responses.create(
+        stream = await client.responses.create(
             input=messages,  # type: ignore # For the responses API, we pass messages as 'input'
             model=model,
             stream=True,
@@ -118,20 +131,25 @@ class OpenAIProvider:
             store=False,
         )
 
+        # Bind the event classes locally so each dispatch is a plain type check
+        text_delta_event = ResponseTextDeltaEvent
+        # Every terminal event carries the response, so usage is reported however the response ended
+        usage_events = (ResponseCompletedEvent, ResponseIncompleteEvent, ResponseFailedEvent)
+
         # Process each chunk in the stream
-        for event in stream:
+        async for event in stream:
             # Text delta events - yield the text content
-            if hasattr(event, "type") and event.type == "response.output_text.delta":
+            if isinstance(event, text_delta_event):
                 yield event.delta
 
-            # Usage events - yield a dictionary with usage information
-            # Response usage events - yield a dictionary with usage information
-            elif hasattr(event, "response") and hasattr(event.response, "usage") and event.response.usage is not None:
+            # Response finished events - yield a dictionary with usage information
+            elif isinstance(event, usage_events) and event.response.usage is not None:
+                usage = event.response.usage
                 # Convert to camelCase for consistency with the frontend
                 usage_info = {
                     "usage": {
-                        "promptTokens": event.response.usage.input_tokens,
-                        "completionTokens": event.response.usage.output_tokens,
+                        "promptTokens": usage.input_tokens,
+                        "completionTokens": usage.output_tokens,
                     }
                 }
                 yield usage_info
@@ -153,12 +171,12 @@ class OpenAIProvider:
         Returns:
             The complete response text.
         """
-        client = self.get_client()
+        client = self._client
         if model is None:
             model = DEFAULT_MODEL
 
         messages = [
-            {"role": "system", "content": system_message},
+            _system_entry(system_message),
             {"role": "user", "content": user_message},
         ]
 
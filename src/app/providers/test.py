@@ -5,10 +5,14 @@ This provider handles specific test prompts with predetermined responses,
 useful for frontend testing and development.
 """
 
+import asyncio
 import re
-from collections.abc import Generator
+from collections.abc import AsyncGenerator
+from functools import lru_cache
 from typing import Any
 
+import orjson
+
 from app.custom_logger import get_logger
 from app.models.chat import ChatRequest
 
@@ -19,17 +23,41 @@ logger = get_logger("test_provider")
 
 # Pattern for matching test prompts
 TEST_PROMPT_PATTERN = re.compile(r"^Test prompt (\d+)$")
+# Bound once so matching skips the attribute lookup on every call.
+# fullmatch keeps "$" from accepting a trailing newline, matching the prefix check below.
+_TEST_MATCH = TEST_PROMPT_PATTERN.fullmatch
+
+# Literal prefix checked before the regex so ordinary messages never reach the regex engine
+TEST_PROMPT_PREFIX = "Test prompt "
+_TEST_PREFIX_LEN = len(TEST_PROMPT_PREFIX)
+
+# Number of prompt numbers whose encoded frames are kept; the number comes from the request,
+# so the cache is bounded
+_ENCODED_TOKENS_CACHE_SIZE = 128
+
+# Usage reported for every test response
+_TEST_USAGE = {"usage": {"promptTokens": 3, "completionTokens": 3}}
 
 
 def is_test_prompt(message: str) -> bool:
     """Check if a message matches the test prompt pattern."""
-    return TEST_PROMPT_PATTERN.match(message) is not None
+    return message.startswith(TEST_PROMPT_PREFIX) and _TEST_MATCH(message) is not None
 
 
 def get_test_prompt_number(message: str) -> str | None:
-    """Extract the number from a test prompt message."""
-    match = TEST_PROMPT_PATTERN.match(message)
-    return match.group(1) if match else None
+    """Extract the number from a test prompt message, using string methods instead of the regex engine."""
+    if not message.startswith(TEST_PROMPT_PREFIX):
+        return None
+    number = message[_TEST_PREFIX_LEN:]
+    # isdecimal matches the same characters as the pattern's \d
+    return number if number.isdecimal() else None
+
+
+@lru_cache(maxsize=_ENCODED_TOKENS_CACHE_SIZE)
+def _get_encoded_tokens(prompt_number: str) -> tuple[bytes, ...]:
+    """Return the response frames for a test prompt number, pre-encoded in the data stream format."""
+    tokens = ("Test ", "response ", prompt_number)
+    return tuple(b"0:" + orjson.dumps(token) + b"\n" for token in tokens)
 
 
 class TestProvider:
@@ -41,12 +69,10 @@ class TestProvider:
 
         This method exists for compatibility but is not used by the test provider.
         """
-        messages = []
-        for message in request.messages:
-            role = message.role
-            content = " ".join(part.text for part in message.parts if part.type == "text")
-            messages.append({"role": role, "content": content})
-        return messages
+        return [
+            {"role": message.role, "content": " ".join(part.text for part in message.parts if part.type == "text")}
+            for message in request.messages
+        ]
 
     def get_response(self, system_message: str, user_message: str) -> str:  # noqa ARG002
         """
@@ -57,20 +83,22 @@ class TestProvider:
         prompt_number = get_test_prompt_number(user_message)
         if prompt_number:
             title = f"Test title {prompt_number}"
-            logger.info(f"Test provider returning title: {title} for prompt: {user_message}")
+            logger.info("Test provider returning title: %s for prompt: %s", title, user_message)
             return title
 
         # This shouldn't happen if the provider is used correctly
-        logger.error(f"Test provider called with non-test prompt: {user_message}")
+        logger.error("Test provider called with non-test prompt: %s", user_message)
         return "Test Provider Error"
 
-    def stream_chat_response(
+    async def stream_chat_response(
         self,
         messages: list[dict[str, str]],
         system_message: str | None = None,  # noqa ARG002
-    ) -> Generator[str | dict[str, Any], None, None]:
+    ) -> AsyncGenerator[str | bytes | dict[str, Any], None]:
         """
-        Stream a chat response with 100ms delays between tokens.
+        Stream a chat response with STREAM_CHUNK_DELAY seconds between tokens.
+
+        Tokens are yielded as pre-encoded text frames that are written to the wire as-is.
         """
         # Get the last user message
         last_user_message = None
@@ -82,22 +110,20 @@ class TestProvider:
         if last_user_message:
             prompt_number = get_test_prompt_number(last_user_message)
             if prompt_number:
-                tokens = ["Test ", "response ", str(prompt_number)]
-                logger.info(f"Test provider streaming response for prompt: {last_user_message}")
+                tokens = _get_encoded_tokens(prompt_number)
+                logger.info("Test provider streaming response for prompt: %s", last_user_message)
 
                 # Stream tokens with delay
                 for token in tokens:
                     yield token
-                    # Sleep for 100ms (this works because FastAPI handles sync generators)
-                    import time
-
-                    time.sleep(STREAM_CHUNK_DELAY)
+                    # Sleep without blocking the event loop for other requests
+                    await asyncio.sleep(STREAM_CHUNK_DELAY)
 
                 # Yield usage data
-                yield {"usage": {"promptTokens": 3, "completionTokens": 3}}
+                yield _TEST_USAGE
             else:
                 # This shouldn't happen if the provider is used correctly
-                logger.error(f"Test provider called with non-test prompt: {last_user_message}")
+                logger.error("Test provider called with non-test prompt: %s", last_user_message)
                 yield "Test Provider Error"
         else:
             logger.error("Test provider called without user message")
@@ -6,10 +6,12 @@ This module contains the routes for chat-related endpoints.
 
 import uuid
 from collections.abc import AsyncGenerator
+from datetime import datetime
 
 from fastapi import APIRouter, HTTPException, Query, Request, status
-from fastapi.responses import StreamingResponse
-from pydantic import ValidationError
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from pydantic import TypeAdapter, ValidationError
 
 from app.custom_logger import get_logger
 from app.db.chat import (
@@ -41,15 +43,26 @@ from app.models.chat import (
 )
 from app.models.common import ErrorResponse
 from app.prompts import CHAT_SYSTEM_PROMPT
-from app.providers.factory import default_provider
-from app.providers.test import is_test_prompt, test_provider
-from app.utils import stream_chat_chunks
+from app.providers.factory import get_provider_for_message
+from app.utils import StreamError, coalesce_chunks, create_streaming_response
 
 # Configure logging
 logger = get_logger("chat_route")
 
 # Create a router for the chat endpoints
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Adapters built once so list responses are serialized straight to JSON bytes
+_MESSAGE_LIST = TypeAdapter(list[Message])
+_VOTE_LIST = TypeAdapter(list[Vote])
+
+# The save-messages body is validated from the raw bytes rather than a typed parameter, so its
+# schema is documented explicitly; nested models point at components their response routes register
+_SAVE_MESSAGES_BODY_SCHEMA = {
+    key: value
+    for key, value in SaveMessagesRequest.model_json_schema(ref_template="#/components/schemas/{model}").items()
+    if key != "$defs"
+}
 
 
 @router.post(
@@ -72,72 +85,48 @@ async def handle_chat_data(chat_id: str, request: ChatRequest, req: Request) ->
     Returns:
         A streaming response with chat completions.
     """
-    logger.debug(f"Starting chat response for chat_id: {chat_id}")
+    logger.debug("Starting chat response for chat_id: %s", chat_id)
     try:
         # Generate message ID immediately before any provider calls
         message_id = str(uuid.uuid4())
 
-        # Check if the last message is a test prompt
+        # Pick the provider from the last message (test prompts use the test provider)
         last_message_text = request.messages[-1].parts[0].text if request.messages else None
-        provider = test_provider if (last_message_text and is_test_prompt(last_message_text)) else default_provider
+        provider = get_provider_for_message(last_message_text)
 
         # Format messages for the provider
         provider_messages = provider.format_messages_from_request(request)
 
-        # Create generator for immediate first chunk
-        async def immediate_first_chunk() -> AsyncGenerator[bytes, None]:
-            yield f'f:{{"messageId":"{message_id}"}}\n'.encode()
-
-        # Create generator for the rest of the chunks
-        async def delayed_chunks() -> AsyncGenerator[bytes, None]:
-            # Create a generator for the provider response
-            async def generate_provider_chunks() -> AsyncGenerator[str | dict, None]:
-                try:
-                    chunk_count = 0
-                    logger.debug("Starting generation loop")
-                    for chunk in provider.stream_chat_response(provider_messages, system_message=CHAT_SYSTEM_PROMPT):
-                        # check if client is disconnected
-                        if await req.is_disconnected():
-                            logger.debug(f"Client disconnected after {chunk_count} chunks")
-                            break
-                        # Only count text chunks, not usage information
-                        if isinstance(chunk, str):
-                            chunk_count += 1
-                            if chunk_count % 10 == 0:  # Log every 10 chunks
-                                logger.debug(f"Sent {chunk_count} chunks")
-                        yield chunk
-                    logger.debug(f"Generation complete - yielded {chunk_count} text chunks")
-                except Exception as e:
-                    logger.error(f"Error generating response: {e}")
-                    yield f"Error: {e}"
-
-            # Stream the provider chunks through stream_chat_chunks
-            async for chunk in stream_chat_chunks(generate_provider_chunks()):
-                yield chunk
-
-        # Combine both generators
-        async def combined_stream() -> AsyncGenerator[bytes, None]:
-            # First, yield the immediate message ID chunk
-            async for chunk in immediate_first_chunk():
-                yield chunk
-            # Then, yield all the delayed chunks
-            async for chunk in delayed_chunks():
-                yield chunk
-
-        # Return a streaming response with the combined stream
-        response = StreamingResponse(combined_stream(), media_type="text/event-stream")
-
-        # Add required headers
-        response.headers["Cache-Control"] = "no-cache"
-        response.headers["Connection"] = "keep-alive"
-        response.headers["x-vercel-ai-data-stream"] = "v1"
+        # Create a generator for the provider response
+        async def generate_provider_chunks() -> AsyncGenerator[str | bytes | dict | StreamError, None]:
+            try:
+                chunk_count = 0
+                logger.debug("Starting generation loop")
+                async for chunk in provider.stream_chat_response(provider_messages, system_message=CHAT_SYSTEM_PROMPT):
+                    # check if client is disconnected
+                    if await req.is_disconnected():
+                        logger.debug("Client disconnected after %s chunks", chunk_count)
+                        break
+                    # Only count text chunks, not usage information
+                    if isinstance(chunk, str | bytes):
+                        chunk_count += 1
+                        if chunk_count % 10 == 0:  # Log every 10 chunks
+                            logger.debug("Sent %s chunks", chunk_count)
+                    yield chunk
+                logger.debug("Generation complete - yielded %s text chunks", chunk_count)
+            except Exception as e:
+                logger.error("Error generating response: %s", e)
+                yield StreamError(str(e))
+
+        # Return a streaming response that sends the message ID first, then the provider chunks
+        response = create_streaming_response(coalesce_chunks(generate_provider_chunks()), message_id=message_id)
 
         logger.info("Returning streaming response")
         return response
 
     except Exception as e:
         # Log the error
-        logger.error(f"Error processing chat request: {e}")
+        logger.error("Error processing chat request: %s", e)
 
         # Raise an HTTPException that FastAPI will handle
         raise HTTPException(
@@ -148,132 +137,119 @@ async def handle_chat_data(chat_id: str, request: ChatRequest, req: Request) ->
 # Database endpoints for chats, messages, votes, and streams
 
 
+def _validate_iso_timestamp(timestamp: str) -> None:
+    """
+    Raise ValueError if the timestamp is not in ISO format.
+
+    fromisoformat accepts a trailing "Z" on Python 3.11+, so no normalization is needed.
+    """
+    datetime.fromisoformat(timestamp)
+
+
 @router.get("/api/chats/{chat_id}", response_model=Chat, response_model_exclude_none=True)
-async def get_chat(chat_id: str) -> Chat:
+def get_chat(chat_id: str) -> Chat:
     """Get chat by ID."""
-    logger.debug(f"Getting chat by ID: {chat_id}")
-    try:
-        chat = get_chat_by_id(chat_id)
-    except Exception as err:
-        logger.error("Failed to get chat %s: %s", chat_id, err)
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error") from err
+    logger.debug("Getting chat by ID: %s", chat_id)
+    chat = get_chat_by_id(chat_id)
     if not chat:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Chat with ID '{chat_id}' not found")
     return chat
 
 
 @router.post("/api/chats", response_model=Chat, status_code=status.HTTP_201_CREATED, response_model_exclude_none=True)
-async def create_chat(request: CreateChatRequest) -> Chat:
+def create_chat(request: CreateChatRequest) -> Chat:
     """Create a new chat."""
-    logger.debug(f"Creating chat: {request}")
+    logger.debug("Creating chat: %s", request)
     try:
         return save_chat(request.chat_id, request.user_id, request.title, request.visibility)
     except ValidationError as err:
         logger.error("Validation error creating chat: %s", err)
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Invalid chat data") from err
-    except Exception as err:
-        logger.error("Failed to create chat: %s", err)
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error") from err
 
 
 @router.delete("/api/chats/{chat_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_chat(chat_id: str) -> None:
+def delete_chat(chat_id: str) -> None:
     """Delete a chat and all its related items."""
-    try:
-        delete_chat_by_id(chat_id)
-    except Exception as err:
-        logger.error("Failed to delete chat %s: %s", chat_id, err)
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error") from err
+    delete_chat_by_id(chat_id)
 
 
 @router.patch("/api/chats/{chat_id}/visibility", status_code=status.HTTP_204_NO_CONTENT)
-async def update_chat_visibility(chat_id: str, request: UpdateChatVisibilityRequest) -> None:
+def update_chat_visibility(chat_id: str, request: UpdateChatVisibilityRequest) -> None:
     """Update chat visibility."""
-    try:
-        update_chat_visibility_by_id(chat_id, request.visibility)
-    except Exception as err:
-        logger.error("Failed to update chat visibility %s: %s", chat_id, err)
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error") from err
+    update_chat_visibility_by_id(chat_id, request.visibility)
 
 
-@router.get("/api/chats/{chat_id}/messages", response_model=list[Message], response_model_exclude_none=True)
-async def get_chat_messages(chat_id: str) -> list[Message]:
+@router.get("/api/chats/{chat_id}/messages", response_model=None, responses={200: {"model": list[Message]}})
+def get_chat_messages(chat_id: str) -> Response:
     """Get all messages for a chat."""
-    try:
-        return get_messages_by_chat_id(chat_id)
-    except Exception as err:
-        logger.error("Failed to get messages for chat %s: %s", chat_id, err)
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error") from err
+    content = _MESSAGE_LIST.dump_json(get_messages_by_chat_id(chat_id), by_alias=True, exclude_none=True)
+    return Response(content=content, media_type="application/json")
 
 
 @router.get("/api/messages/{message_id}", response_model=Message, response_model_exclude_none=True)
-async def get_message(message_id: str) -> Message:
+def get_message(message_id: str) -> Message:
     """Get a specific message by ID."""
-    try:
-        message = get_message_by_id(message_id)
-    except Exception as err:
-        logger.error("Failed to get message %s: %s", message_id, err)
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error") from err
+    message = get_message_by_id(message_id)
     if not message:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Message with ID '{message_id}' not found")
     return message
 
 
-@router.post("/api/chats/{chat_id}/messages", status_code=status.HTTP_201_CREATED)
-async def save_chat_messages(chat_id: str, request: SaveMessagesRequest) -> None:
-    """Save messages to a chat."""
+@router.post(
+    "/api/chats/{chat_id}/messages",
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra={
+        "requestBody": {"required": True, "content": {"application/json": {"schema": _SAVE_MESSAGES_BODY_SCHEMA}}}
+    },
+)
+async def save_chat_messages(chat_id: str, req: Request) -> None:
+    """
+    Save messages to a chat.
+
+    The body is validated directly from the raw JSON bytes, which skips FastAPI's
+    intermediate decode to Python objects for what can be a large batch of messages.
+    """
+    logger.debug("Saving messages to chat: %s", chat_id)
     try:
-        save_messages(request.user_id, request.messages)
+        request = SaveMessagesRequest.model_validate_json(await req.body())
+        # The handler is async to read the body, so the blocking write is moved off the event loop
+        await run_in_threadpool(save_messages, request.user_id, request.messages)
     except ValidationError as err:
         logger.error("Validation error saving messages: %s", err)
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Invalid message data") from err
-    except Exception as err:
-        logger.error("Failed to save messages to chat %s: %s", chat_id, err)
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error") from err
 
 
 @router.delete("/api/chats/{chat_id}/messages", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_chat_messages_after_timestamp(
+def delete_chat_messages_after_timestamp(
     chat_id: str, timestamp: str = Query(description="ISO timestamp to delete messages after")
 ) -> None:
     """Delete messages after a given timestamp."""
     try:
         # Validate timestamp format but keep as string
-        from datetime import datetime
-
-        datetime.fromisoformat(timestamp)  # Just for validation
+        _validate_iso_timestamp(timestamp)
         delete_messages_by_chat_id_after_timestamp(chat_id, timestamp)
     except ValueError as err:
         logger.error("Invalid timestamp format: %s", err)
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Invalid timestamp format. Use ISO format."
         ) from err
-    except Exception as err:
-        logger.error("Failed to delete messages for chat %s: %s", chat_id, err)
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error") from err
 
 
 @router.post("/api/chats/{chat_id}/messages/{message_id}/vote", status_code=status.HTTP_201_CREATED)
-async def vote_on_message(chat_id: str, message_id: str, request: VoteMessageRequest) -> None:
+def vote_on_message(chat_id: str, message_id: str, request: VoteMessageRequest) -> None:
     """Vote on a message."""
     try:
         vote_message(chat_id, message_id, request.vote_type)
     except ValidationError as err:
         logger.error("Validation error voting on message: %s", err)
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Invalid vote data") from err
-    except Exception as err:
-        logger.error("Failed to vote on message %s: %s", message_id, err)
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error") from err
 
 
-@router.get("/api/chats/{chat_id}/votes", response_model=list[Vote], response_model_exclude_none=True)
-async def get_chat_votes(chat_id: str) -> list[Vote]:
+@router.get("/api/chats/{chat_id}/votes", response_model=None, responses={200: {"model": list[Vote]}})
+def get_chat_votes(chat_id: str) -> Response:
     """Get all votes for a chat."""
-    try:
-        return get_votes_by_chat_id(chat_id)
-    except Exception as err:
-        logger.error("Failed to get votes for chat %s: %s", chat_id, err)
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error") from err
+    content = _VOTE_LIST.dump_json(get_votes_by_chat_id(chat_id), by_alias=True, exclude_none=True)
+    return Response(content=content, media_type="application/json")
 
 
 @router.post(
@@ -282,24 +258,16 @@ async def get_chat_votes(chat_id: str) -> list[Vote]:
     status_code=status.HTTP_201_CREATED,
     response_model_exclude_none=True,
 )
-async def create_stream(chat_id: str, request: CreateStreamRequest) -> Stream:
+def create_stream(chat_id: str, request: CreateStreamRequest) -> Stream:
     """Create a stream ID for a chat."""
     try:
         return create_stream_id(request.stream_id, chat_id)
     except ValidationError as err:
         logger.error("Validation error creating stream: %s", err)
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Invalid stream data") from err
-    except Exception as err:
-        logger.error("Failed to create stream for chat %s: %s", chat_id, err)
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error") from err
 
 
-@router.get("/api/chats/{chat_id}/streams", response_model=StreamIdsResponse, response_model_exclude_none=True)
-async def get_chat_streams(chat_id: str) -> StreamIdsResponse:
+@router.get("/api/chats/{chat_id}/streams", response_model=None, responses={200: {"model": StreamIdsResponse}})
+def get_chat_streams(chat_id: str) -> ORJSONResponse:
     """Get all stream IDs for a chat."""
-    try:
-        stream_ids = get_stream_ids_by_chat_id(chat_id)
-        return StreamIdsResponse(stream_ids=stream_ids)
-    except Exception as err:
-        logger.error("Failed to get streams for chat %s: %s", chat_id, err)
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error") from err
+    return ORJSONResponse(content={"ids": get_stream_ids_by_chat_id(chat_id)})
@@ -5,31 +5,32 @@ This module contains the routes for title generation endpoints.
 """
 
 from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import ORJSONResponse
 
 from app.custom_logger import get_logger
 from app.models.common import ErrorResponse, TextResponse
 from app.models.title import GenerateTitleRequest
 from app.prompts import GENERATE_TITLE_PROMPT
-from app.providers.factory import default_provider
-from app.providers.test import is_test_prompt, test_provider
+from app.providers.factory import get_provider_for_message
 
 # Configure logging
 logger = get_logger("title_route")
 
 # Create a router for the title endpoints
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
 
 @router.post(
     "/api/titles/generate",
-    response_model=TextResponse,
+    response_model=None,
     responses={
+        200: {"model": TextResponse},
         401: {"model": ErrorResponse, "description": "Unauthorized"},
         400: {"model": ErrorResponse, "description": "Bad Request"},
         500: {"model": ErrorResponse, "description": "Internal Server Error"},
     },
 )
-async def generate_title(request: GenerateTitleRequest) -> TextResponse:
+def generate_title(request: GenerateTitleRequest) -> ORJSONResponse:
     """
     Generate a title based on a user message.
 
@@ -52,7 +53,7 @@ async def generate_title(request: GenerateTitleRequest) -> TextResponse:
 
     try:
         # Use test provider for test prompts, default provider otherwise
-        provider = test_provider if is_test_prompt(message_text) else default_provider
+        provider = get_provider_for_message(message_text)
 
         # Call the get_response function with the system prompt and user message
         title = provider.get_response(system_message=GENERATE_TITLE_PROMPT, user_message=message_text)
@@ -65,11 +66,12 @@ async def generate_title(request: GenerateTitleRequest) -> TextResponse:
             },
         )
 
-        return TextResponse(text=title)
+        # The payload is a single string, so it is written directly without a model round-trip
+        return ORJSONResponse(content={"text": title})
 
     except Exception as e:
         # Log the error
-        logger.error(f"Error generating title: {e}")
+        logger.error("Error generating title: %s", e)
 
         # Raise an HTTPException that FastAPI will handle
         raise HTTPException(
@@ -6,6 +6,7 @@ retrieval, and OAuth user management.
 """
 
 from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse
 from pydantic import ValidationError
 
 from app.custom_logger import get_logger
@@ -22,17 +23,13 @@ from app.models.user import (
 logger = get_logger("user_routes")
 
 # Create a router for user endpoints
-router = APIRouter(prefix="/api")
+router = APIRouter(prefix="/api", default_response_class=ORJSONResponse)
 
 
 @router.get("/users/{email}", response_model=User, response_model_exclude_none=True)
-async def get_user_by_email(email: str) -> User:
+def get_user_by_email(email: str) -> User:
     """Get user by email address."""
-    try:
-        user = get_user(email)
-    except Exception as err:
-        logger.error("Failed to get user by email %s: %s", email, err)
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error") from err
+    user = get_user(email)
 
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"User with email '{email}' not found")
@@ -41,7 +38,7 @@ async def get_user_by_email(email: str) -> User:
 
 
 @router.post("/users", response_model=User, status_code=status.HTTP_201_CREATED, response_model_exclude_none=True)
-async def create_email_user_endpoint(request: CreateEmailUserRequest) -> User:
+def create_email_user_endpoint(request: CreateEmailUserRequest) -> User:
     """Create a new email user."""
     try:
         # Check if user already exists
@@ -53,29 +50,20 @@ async def create_email_user_endpoint(request: CreateEmailUserRequest) -> User:
 
         user = create_user(request.email, request.password_hash)
         return user
-    except HTTPException:
-        raise  # Re-raise HTTPException as-is
     except ValidationError as err:
         logger.error("Validation error creating user: %s", err)
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Invalid user data") from err
-    except Exception as err:
-        logger.error("Failed to create user %s: %s", request.email, err)
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error") from err
 
 
 @router.post("/users/guest", response_model=User, status_code=status.HTTP_201_CREATED, response_model_exclude_none=True)
-async def create_guest_user_endpoint() -> User:
+def create_guest_user_endpoint() -> User:
     """Create a new guest user."""
-    try:
-        user = create_guest_user()
-        return user
-    except Exception as err:
-        logger.error("Failed to create guest user: %s", err)
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error") from err
+    user = create_guest_user()
+    return user
 
 
 @router.post("/users/oauth", response_model=User, status_code=status.HTTP_201_CREATED, response_model_exclude_none=True)
-async def create_oauth_user(request: CreateOAuthUserRequest) -> User:
+def create_oauth_user(request: CreateOAuthUserRequest) -> User:
     """Create or get a user via OAuth."""
     try:
         user = get_or_create_user_from_oauth(request.email, request.provider, request.provider_account_id)
@@ -83,34 +71,28 @@ async def create_oauth_user(request: CreateOAuthUserRequest) -> User:
     except ValidationError as err:
         logger.error("Validation error creating OAuth user: %s", err)
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Invalid OAuth user data") from err
-    except Exception as err:
-        logger.error("Failed to create OAuth user: %s", err)
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error") from err
 
 
-@router.get("/users/{user_id}/chats", response_model=ChatListResponse)
-async def get_user_chats(
+@router.get("/users/{user_id}/chats", response_model=None, responses={200: {"model": ChatListResponse}})
+def get_user_chats(
     user_id: str,
     limit: int = Query(default=20, ge=1, le=100),
     starting_after: str | None = Query(default=None),
     ending_before: str | None = Query(default=None),
-) -> ChatListResponse:
-    """Get chats for a user with pagination."""
-    try:
-        return get_chats_by_user_id(user_id, limit, starting_after, ending_before)
-    except Exception as err:
-        logger.error("Failed to get chats for user %s: %s", user_id, err)
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error") from err
+) -> ORJSONResponse:
+    """
+    Get chats for a user with pagination.
+
+    The payload is already in wire format, so it is serialized with orjson directly;
+    ChatListResponse only documents the schema.
+    """
+    return ORJSONResponse(content=get_chats_by_user_id(user_id, limit, starting_after, ending_before))
 
 
 @router.get("/users/{user_id}/message-count", response_model=MessageCountResponse)
-async def get_user_message_count(
+def get_user_message_count(
     user_id: str, hours: int = Query(default=24, ge=1, description="Number of hours to look back")
 ) -> MessageCountResponse:
     """Get message count for a user in the last N hours."""
-    try:
-        count = get_message_count_by_user_id(user_id, hours)
-        return MessageCountResponse(count=count)
-    except Exception as err:
-        logger.error("Failed to get message count for user %s: %s", user_id, err)
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error") from err
+    count = get_message_count_by_user_id(user_id, hours)
+    return MessageCountResponse(count=count)
@@ -2,18 +2,42 @@
 Utility functions for the chatbot backend.
 """
 
-import json
+import asyncio
+import hmac
 from collections.abc import AsyncGenerator
 
-from fastapi import Request, status
-from fastapi.responses import JSONResponse, StreamingResponse
+import orjson
+from fastapi import Request, Response, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
 
-from app.config import API_PREFIX, get_api_secret
+from app.config import API_PREFIX, get_api_secret_bytes
 from app.custom_logger import get_logger
 
 # Configure logging
 logger = get_logger("utils")
 
+# Length of the API route prefix, so route checks are a slice comparison
+_API_PREFIX_LEN = len(API_PREFIX)
+
+# Buffered text is flushed once it reaches this many characters or has waited this many seconds
+COALESCE_MAX_CHARS = 64
+COALESCE_WINDOW_SECONDS = 0.02
+
+# Static data stream framing, encoded once
+_MESSAGE_ID_PREFIX = b'f:{"messageId":"'
+_MESSAGE_ID_SUFFIX = b'"}\n'
+_STEP_FINISH_PREFIX = b'e:{"finishReason":"stop","usage":'
+_STEP_FINISH_SUFFIX = b',"isContinued":false}\n'
+_FINISH_PREFIX = b'd:{"finishReason":"stop","usage":'
+_FINISH_SUFFIX = b"}\n"
+_FALLBACK_FINISH_FRAMES = b'e:{"finishReason":"stop","isContinued":false}\nd:{"finishReason":"stop"}\n'
+
+# Headers required by the data stream protocol
+_STREAM_HEADERS = {"Cache-Control": "no-cache", "Connection": "keep-alive", "x-vercel-ai-data-stream": "v1"}
+
+# The authentication error body never changes, so it is serialized once
+_AUTH_ERROR_BODY = orjson.dumps({"message": "Invalid or missing API key"})
+
 
 async def verify_api_key(request: Request) -> bool:
     """
@@ -30,15 +54,16 @@ async def verify_api_key(request: Request) -> bool:
     if not auth_header:
         return False
 
-    # Check for Bearer format
-    parts = auth_header.split()
-    if len(parts) != 2 or parts[0].lower() != "bearer":
+    # Check for "Bearer <token>" format without splitting the header
+    if auth_header[:7].lower() != "bearer ":
         return False
 
-    token = parts[1]
-    api_secret = get_api_secret()
+    token = auth_header[7:]
+    if not token or " " in token:
+        return False
 
-    return token == api_secret
+    # Constant-time comparison so response timing does not reveal how much of the token matched
+    return hmac.compare_digest(token.encode(), get_api_secret_bytes())
 
 
 def is_api_route(path: str) -> bool:
@@ -51,126 +76,227 @@ def is_api_route(path: str) -> bool:
     Returns:
         True if the path is an API route, False otherwise.
     """
-    return path.startswith(API_PREFIX)
+    return path[:_API_PREFIX_LEN] == API_PREFIX
+
+
+class StreamError:
+    """
+    Error raised by a provider while streaming, passed along the chunk stream.
+
+    Errors are marked with their own type instead of a text prefix, so they are never
+    merged with text chunks and provider text that looks like an error stays text.
+    """
+
+    __slots__ = ("message",)
+
+    def __init__(self, message: str) -> None:
+        """
+        Create a stream error.
 
+        Args:
+            message: The error message sent to the client.
+        """
+        self.message = message
 
-async def format_error_stream(message: str) -> AsyncGenerator[bytes, None]:
+
+async def coalesce_chunks(
+    chunks: AsyncGenerator[str | bytes | dict | StreamError, None],
+    max_chars: int = COALESCE_MAX_CHARS,
+    window: float = COALESCE_WINDOW_SECONDS,
+) -> AsyncGenerator[str | bytes | dict | StreamError, None]:
     """
-    Format an error message as a streaming response.
+    Merge consecutive text chunks into larger chunks.
+
+    Text that arrives after a quiet period is sent immediately and opens a window of
+    window seconds. Text arriving inside the window is buffered until the window closes
+    or the buffer reaches max_chars, so fast token streams produce fewer frames while
+    the first token is never delayed. Stream errors, pre-encoded bytes and usage
+    dictionaries flush the buffer and are passed through unchanged, preserving their
+    order relative to the text.
 
     Args:
-        message: The error message.
+        chunks: An async generator of text chunks or usage information.
+        max_chars: Buffered text size that triggers an immediate flush.
+        window: Number of seconds after a flush during which text is buffered.
 
     Yields:
-        Formatted error message bytes.
+        The same chunks, with runs of text chunks joined together.
     """
-    # Format according to the specification:
-    # e:error\n
-    # d:{"message":"error description"}\n\n
-    yield b"e:error\n"
-    yield f"d:{json.dumps({'message': message})}\n\n".encode()
+    loop = asyncio.get_running_loop()
+    buffer: list[str] = []
+    buffered_chars = 0
+    flush_at = 0.0
+    # A read only runs as a separate task while text is buffered, so it can be raced against
+    # the window. It is kept across timeouts; cancelling it would close the upstream generator.
+    pending: asyncio.Future | None = None
+
+    try:
+        while True:
+            try:
+                if buffer:
+                    if pending is None:
+                        pending = asyncio.ensure_future(anext(chunks))
+                    done, _ = await asyncio.wait({pending}, timeout=max(flush_at - loop.time(), 0))
+                    if not done:
+                        # The window closed before the next chunk arrived
+                        yield "".join(buffer)
+                        buffer.clear()
+                        buffered_chars = 0
+                        flush_at = loop.time() + window
+                        continue
+                    future, pending = pending, None
+                    chunk = future.result()
+                elif pending is not None:
+                    # A read started while text was buffered; with nothing held back it needs no deadline
+                    future, pending = pending, None
+                    chunk = await future
+                else:
+                    chunk = await anext(chunks)
+            except StopAsyncIteration:
+                break
+
+            if type(chunk) is str:
+                buffer.append(chunk)
+                buffered_chars += len(chunk)
+                if buffered_chars >= max_chars or loop.time() >= flush_at:
+                    yield "".join(buffer)
+                    buffer.clear()
+                    buffered_chars = 0
+                    flush_at = loop.time() + window
+                continue
+
+            if buffer:
+                yield "".join(buffer)
+                buffer.clear()
+                buffered_chars = 0
+            yield chunk
 
+        if buffer:
+            yield "".join(buffer)
+    finally:
+        if pending is not None:
+            pending.cancel()
 
-async def stream_chat_chunks(chunks: AsyncGenerator[str | dict, None]) -> AsyncGenerator[bytes, None]:
+
+async def stream_chat_chunks(
+    chunks: AsyncGenerator[str | bytes | dict | StreamError, None], message_id: str | None = None
+) -> AsyncGenerator[bytes, None]:
     """
     Format chat chunks as a streaming response.
 
     Args:
         chunks: An async generator of text chunks or usage information.
-               Text chunks are strings.
+               Text chunks are strings, or bytes that are already formatted frames.
                Usage information is a dictionary with the format:
                {"usage": {"promptTokens": int, "completionTokens": int}}
+               Provider errors are StreamError instances.
+        message_id: Optional message ID, sent as the first chunk before any provider output.
 
     Yields:
         Formatted chat chunks with the format:
-        - f:{"messageId":"<uuid>"}\n  for first chunk with message ID (already sent)
+        - f:{"messageId":"<uuid>"}\n  for first chunk with message ID (when message_id is given)
         - 0:[json-encoded-text]\n  for normal text chunks
         - 3:[json-encoded-error-message]\n  for error message chunks
         - e:{"finishReason":"stop","usage":{"promptTokens":X,"completionTokens":Y},"isContinued":false}\n
             for step finish chunk
         - d:{"finishReason":"stop","usage":{"promptTokens":X,"completionTokens":Y}}\n  for finish chunk
     """
+    # Send the message ID immediately; UUIDs are ASCII, so no JSON encoding is needed
+    if message_id is not None:
+        yield _MESSAGE_ID_PREFIX + message_id.encode("ascii") + _MESSAGE_ID_SUFFIX
+
     try:
         # Store usage information if found
         usage_info = None
 
         # Stream each chunk with the proper format
         async for chunk in chunks:
+            # Text chunks are by far the most common, so they are checked first with an exact type test
+            if type(chunk) is str:
+                # Handle normal text chunks with code 0
+                if chunk:
+                    yield b"0:" + orjson.dumps(chunk) + b"\n"
+
+            # Pre-encoded frames are passed through without re-encoding
+            elif type(chunk) is bytes:
+                yield chunk
+
+            # Handle provider errors with code 3
+            elif type(chunk) is StreamError:
+                yield b"3:" + orjson.dumps(chunk.message) + b"\n"
+
             # If the chunk is a dictionary, it contains usage information
-            if isinstance(chunk, dict) and "usage" in chunk:
+            elif isinstance(chunk, dict) and "usage" in chunk:
                 # Store the usage information for the final chunk
                 usage_info = chunk["usage"]
-                continue
-
-            # Handle error chunks with code 3
-            elif isinstance(chunk, str) and chunk.startswith("Error:"):
-                error_message = chunk.replace("Error:", "").strip()
-                yield f"3:{json.dumps(error_message)}\n".encode()
-
-            # Handle normal text chunks with code 0
-            elif chunk:
-                yield f"0:{json.dumps(chunk)}\n".encode()
 
         # Send the finish message when complete with the new format
         # Include usage information if available
         if usage_info:
-            step_finish_data = {"finishReason": "stop", "usage": usage_info, "isContinued": False}
-            yield f"e:{json.dumps(step_finish_data)}\n".encode()
-            finish_data = {"finishReason": "stop", "usage": usage_info}
-            yield f"d:{json.dumps(finish_data)}\n".encode()
+            # Both frames embed the same usage object, so it is serialized once,
+            # and they are sent together as a single body message
+            usage_json = orjson.dumps(usage_info)
+            yield _STEP_FINISH_PREFIX + usage_json + _STEP_FINISH_SUFFIX + _FINISH_PREFIX + usage_json + _FINISH_SUFFIX
         else:
             # Fallback if no usage information was provided
-            yield b'e:{"finishReason":"stop","isContinued":false}\n'
-            yield b'd:{"finishReason":"stop"}\n'
+            yield _FALLBACK_FINISH_FRAMES
 
     except Exception as e:
         # Handle any errors during streaming
-        logger.error(f"Error streaming chat: {e}")
+        logger.error("Error streaming chat: %s", e)
         error_message = f"Error streaming chat: {e}"
-        yield f"3:{json.dumps(error_message)}\n".encode()
+        yield b"3:" + orjson.dumps(error_message) + b"\n"
 
 
-def create_streaming_response(chunks: AsyncGenerator[str | dict, None]) -> StreamingResponse:
+def create_streaming_response(
+    chunks: AsyncGenerator[str | bytes | dict | StreamError, None], message_id: str | None = None
+) -> StreamingResponse:
     """
     Create a StreamingResponse with the correct headers.
 
     Args:
         chunks: An async generator of text chunks or usage information.
-               Text chunks are strings.
+               Text chunks are strings, or bytes that are already formatted frames.
                Usage information is a dictionary with usage data.
+               Provider errors are StreamError instances.
+        message_id: Optional message ID to send as the first chunk.
 
     Returns:
         A StreamingResponse object.
     """
-    response = StreamingResponse(stream_chat_chunks(chunks), media_type="text/event-stream")
-
-    # Add required headers
-    response.headers["Cache-Control"] = "no-cache"
-    response.headers["Connection"] = "keep-alive"
-    response.headers["x-vercel-ai-data-stream"] = "v1"
-
-    return response
+    return StreamingResponse(
+        stream_chat_chunks(chunks, message_id), media_type="text/event-stream", headers=_STREAM_HEADERS
+    )
 
 
-def create_error_response(status_code: int, message: str) -> JSONResponse:
+def handle_auth_error() -> Response:
     """
-    Create a standardized error response.
-
-    Args:
-        status_code: HTTP status code.
-        message: Error message.
+    Handle authentication error.
 
     Returns:
-        A JSONResponse with the error details.
+        A 401 Unauthorized response.
     """
-    return JSONResponse(status_code=status_code, content={"message": message})
+    # A fresh Response per call, since middleware may add headers to the response it sends
+    return Response(content=_AUTH_ERROR_BODY, status_code=status.HTTP_401_UNAUTHORIZED, media_type="application/json")
 
 
-def handle_auth_error() -> JSONResponse:
+async def handle_unexpected_error(request: Request, exc: Exception) -> ORJSONResponse:
     """
-    Handle authentication error.
+    Handle an exception that escaped a route handler.
+
+    Registered app-wide so routes only need inline handling for expected errors
+    such as validation failures and missing items. Starlette runs this handler in
+    ServerErrorMiddleware, which sends the 500 response and then re-raises the
+    exception, so the server still logs the traceback.
+
+    Args:
+        request: The FastAPI request object.
+        exc: The unhandled exception.
 
     Returns:
-        A 401 Unauthorized response.
+        A 500 Internal Server Error response.
     """
-    return create_error_response(status_code=status.HTTP_401_UNAUTHORIZED, message="Invalid or missing API key")
+    logger.error("Unhandled error: %s", exc, extra={"route": request.url.path, "method": request.method})
+    return ORJSONResponse(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content={"detail": "Internal server error"}
+    )
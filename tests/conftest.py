@@ -4,7 +4,40 @@ Pytest configuration file.
 This file contains shared fixtures and setup for all tests.
 """
 
+import os
+import uuid
+
+import pytest
 from dotenv import load_dotenv
+from fastapi.testclient import TestClient
 
 # Load environment variables from .env file before running tests
 load_dotenv()
+
+
+@pytest.fixture(scope="session")
+def test_client():
+    """Test client fixture, started once so the app lifespan runs once per session (per xdist worker)."""
+    # Imported here so the app is configured from the environment loaded above
+    from app.main import app
+
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def auth_headers():
+    """Get the auth headers."""
+    api_secret = os.environ.get("API_SECRET", "secret_key")
+    return {"Authorization": f"Bearer {api_secret}"}
+
+
+@pytest.fixture(scope="session")
+def chat_request_data():
+    """Get chat request data, shared by the session since no test modifies it."""
+    return {
+        "messages": [
+            {"role": "user", "parts": [{"type": "text", "text": "Hello, how are you today?"}], "id": str(uuid.uuid4())}
+        ],
+        "userId": "test-user",
+    }
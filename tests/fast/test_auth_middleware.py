@@ -6,15 +6,6 @@ import os
 from unittest.mock import patch
 
 import pytest
-from fastapi.testclient import TestClient
-
-from app.main import app
-
-
-@pytest.fixture
-def test_client():
-    """Test client fixture."""
-    return TestClient(app)
 
 
 @pytest.fixture
@@ -34,8 +25,9 @@ def test_api_route_no_auth_header(test_client):
     """Test API route without auth header."""
     response = test_client.post("/api/titles/generate", json={"text": "Test message"})
     assert response.status_code == 401
-    assert "message" in response.json()
-    assert "Invalid or missing API key" in response.json()["message"]
+    body = response.json()
+    assert "message" in body
+    assert "Invalid or missing API key" in body["message"]
 
 
 def test_api_route_invalid_auth_format(test_client):
@@ -44,8 +36,9 @@ def test_api_route_invalid_auth_format(test_client):
         "/api/titles/generate", headers={"Authorization": "Invalid-Format"}, json={"text": "Test message"}
     )
     assert response.status_code == 401
-    assert "message" in response.json()
-    assert "Invalid or missing API key" in response.json()["message"]
+    body = response.json()
+    assert "message" in body
+    assert "Invalid or missing API key" in body["message"]
 
 
 def test_api_route_invalid_token(test_client):
@@ -54,8 +47,9 @@ def test_api_route_invalid_token(test_client):
         "/api/titles/generate", headers={"Authorization": "Bearer invalid-token"}, json={"text": "Test message"}
     )
     assert response.status_code == 401
-    assert "message" in response.json()
-    assert "Invalid or missing API key" in response.json()["message"]
+    body = response.json()
+    assert "message" in body
+    assert "Invalid or missing API key" in body["message"]
 
 
 def test_api_route_valid_token(test_client, api_secret):
@@ -0,0 +1,33 @@
+"""
+Tests for the chat request models.
+"""
+
+import uuid
+
+import pytest
+from pydantic import ValidationError
+
+from app.models.chat import CreateChatRequest
+
+
+def test_create_chat_request_accepts_very_long_title():
+    """Test that chat titles have no upper length limit."""
+    very_long_title = "x" * 10000
+    request = CreateChatRequest.model_validate({
+        "id": str(uuid.uuid4()),
+        "userId": str(uuid.uuid4()),
+        "title": very_long_title,
+        "visibility": "public",
+    })
+    assert request.title == very_long_title
+
+
+def test_create_chat_request_rejects_empty_title():
+    """Test that an empty chat title fails validation."""
+    with pytest.raises(ValidationError):
+        CreateChatRequest.model_validate({
+            "id": str(uuid.uuid4()),
+            "userId": str(uuid.uuid4()),
+            "title": "",
+            "visibility": "public",
+        })
@@ -0,0 +1,103 @@
+"""
+Tests for the chat routes that need no database.
+"""
+
+import uuid
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.mark.parametrize(
+    "timestamp",
+    ["2024-05-01", "2024-05-01T10:30", "2024-05-01T10:30:15.123456+00:00", "2024-05-01T10:30:15Z"],
+)
+def test_delete_messages_accepts_iso_timestamps(test_client, auth_headers, timestamp):
+    """Test that date-only, minute-precision and full ISO timestamps are accepted."""
+    with patch("app.routes.chat.delete_messages_by_chat_id_after_timestamp") as delete_messages:
+        response = test_client.delete(
+            f"/api/chats/{uuid.uuid4()}/messages", params={"timestamp": timestamp}, headers=auth_headers
+        )
+    assert response.status_code == 204
+    delete_messages.assert_called_once()
+
+
+@pytest.mark.parametrize("timestamp", ["invalid-timestamp", "2024-13-45T99:99:99", "2024-02-30T10:00:00"])
+def test_delete_messages_rejects_invalid_timestamps(test_client, auth_headers, timestamp):
+    """Test that malformed timestamps and impossible dates are rejected before reaching the database."""
+    with patch("app.routes.chat.delete_messages_by_chat_id_after_timestamp") as delete_messages:
+        response = test_client.delete(
+            f"/api/chats/{uuid.uuid4()}/messages", params={"timestamp": timestamp}, headers=auth_headers
+        )
+    assert response.status_code == 422
+    delete_messages.assert_not_called()
+
+
+def test_chat_list_rejects_rows_missing_attributes(auth_headers):
+    """Test that a chat row missing its id is a server error, not a chat with an empty id."""
+    from app.main import app
+
+    # The unexpected error handler re-raises after sending the 500, so the client must not re-raise it
+    client = TestClient(app, raise_server_exceptions=False)
+    row = {"user_id": "user-1", "chat_created_at": "2024-05-01T10:00:00+00:00", "title": "Chat", "visibility": "public"}
+    with patch("app.db.chat.chats_table") as chats_table:
+        chats_table.query.return_value = {"Items": [row]}
+        response = client.get("/api/users/user-1/chats", headers=auth_headers)
+
+    assert response.status_code == 500
+    assert response.json() == {"detail": "Internal server error"}
+
+
+def iter_refs(node):
+    """Yield every $ref value in a JSON schema document."""
+    if isinstance(node, dict):
+        for key, value in node.items():
+            if key == "$ref":
+                yield value
+            else:
+                yield from iter_refs(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from iter_refs(value)
+
+
+def test_save_messages_body_is_documented(test_client):
+    """Test that the save-messages body schema is in the OpenAPI document and its references resolve."""
+    openapi = test_client.get("/openapi.json").json()
+    request_body = openapi["paths"]["/api/chats/{chat_id}/messages"]["post"]["requestBody"]
+    schema = request_body["content"]["application/json"]["schema"]
+    assert request_body["required"] is True
+    assert schema["required"] == ["userId", "messages"]
+    assert schema["properties"]["messages"]["items"] == {"$ref": "#/components/schemas/Message"}
+
+    components = openapi["components"]["schemas"]
+    for ref in iter_refs(openapi):
+        assert ref.removeprefix("#/components/schemas/") in components, ref
+
+
+def test_save_messages_validates_raw_body(test_client, auth_headers):
+    """Test that a valid body is saved and an invalid one is rejected with 422 before reaching the database."""
+    chat_id = str(uuid.uuid4())
+    message = {
+        "chatId": chat_id,
+        "createdAt": "2024-05-01T10:00:00+00:00",
+        "role": "user",
+        "parts": [{"type": "text", "text": "Hello"}],
+        "attachments": [],
+        "id": str(uuid.uuid4()),
+    }
+    url = f"/api/chats/{chat_id}/messages"
+
+    with patch("app.routes.chat.save_messages") as save_messages:
+        response = test_client.post(url, json={"userId": "user-1", "messages": [message]}, headers=auth_headers)
+        assert response.status_code == 201
+        user_id, messages = save_messages.call_args.args
+        assert user_id == "user-1"
+        assert [m.message_id for m in messages] == [message["id"]]
+
+    with patch("app.routes.chat.save_messages") as save_messages:
+        invalid = {"userId": "user-1", "messages": [{**message, "role": "invalid_role"}]}
+        response = test_client.post(url, json=invalid, headers=auth_headers)
+        assert response.status_code == 422
+        save_messages.assert_not_called()
@@ -0,0 +1,41 @@
+"""
+Tests for the OpenAI provider stream handling, with the OpenAI client mocked.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+from openai.types.responses import ResponseFailedEvent, ResponseTextDeltaEvent
+
+from app.providers.openai import OpenAIProvider
+
+
+async def mock_event_stream(*events):
+    """Yield the given events as the OpenAI client's response stream."""
+    for event in events:
+        yield event
+
+
+def collect_response(provider, events):
+    """Stream a response from the provider over the given events and return its output as a list."""
+
+    async def run():
+        create = AsyncMock(return_value=mock_event_stream(*events))
+        with patch.object(provider._async_client.responses, "create", new=create):
+            return [chunk async for chunk in provider.stream_chat_response([{"role": "user", "content": "Hi"}])]
+
+    return asyncio.run(run())
+
+
+def test_stream_reports_usage_for_failed_response():
+    """Test that a failed response still reports its token usage after the text received before the failure."""
+    usage = SimpleNamespace(input_tokens=12, output_tokens=3)
+    events = [
+        ResponseTextDeltaEvent.model_construct(type="response.output_text.delta", delta="Partial"),
+        ResponseFailedEvent.model_construct(type="response.failed", response=SimpleNamespace(usage=usage)),
+    ]
+
+    chunks = collect_response(OpenAIProvider(), events)
+
+    assert chunks == ["Partial", {"usage": {"promptTokens": 12, "completionTokens": 3}}]
@@ -0,0 +1,97 @@
+"""
+Tests for the chat stream helpers.
+"""
+
+import asyncio
+
+import orjson
+
+from app.utils import StreamError, coalesce_chunks, stream_chat_chunks
+
+# Long enough that no test flushes on the window unless it sleeps past it
+LONG_WINDOW = 10.0
+
+
+async def source(items, delays=None):
+    """Yield the items, sleeping before each one for the matching delay in seconds."""
+    for i, item in enumerate(items):
+        if delays and delays[i]:
+            await asyncio.sleep(delays[i])
+        yield item
+
+
+def collect(chunks):
+    """Run an async generator to completion and return its output as a list."""
+
+    async def run():
+        return [chunk async for chunk in chunks]
+
+    return asyncio.run(run())
+
+
+def test_coalesce_sends_first_chunk_before_window_elapses():
+    """Test that the first text chunk is sent immediately instead of waiting for the window."""
+
+    async def run():
+        coalesced = coalesce_chunks(source(["first", "second"], delays=[0, LONG_WINDOW]), window=LONG_WINDOW)
+        try:
+            return await asyncio.wait_for(anext(coalesced), timeout=1.0)
+        finally:
+            await coalesced.aclose()
+
+    assert asyncio.run(run()) == "first"
+
+
+def test_coalesce_merges_text_within_window():
+    """Test that text chunks arriving within the window after the first one are merged into one chunk."""
+    result = collect(coalesce_chunks(source(["Hel", "lo", " world"]), window=LONG_WINDOW))
+    assert result == ["Hel", "lo world"]
+
+
+def test_coalesce_flushes_at_max_chars():
+    """Test that the buffer is flushed as soon as it reaches max_chars."""
+    result = collect(coalesce_chunks(source(["abc", "def", "gh", "i"]), max_chars=5, window=LONG_WINDOW))
+    assert result == ["abc", "defgh", "i"]
+
+
+def test_coalesce_flushes_when_window_elapses():
+    """Test that buffered text is sent when the next chunk takes longer than the window."""
+    result = collect(coalesce_chunks(source(["a", "b", "c"], delays=[0, 0, 0.2]), window=0.02))
+    assert result == ["a", "b", "c"]
+
+
+def test_coalesce_passes_bytes_and_dicts_through_in_order():
+    """Test that bytes and usage dictionaries flush the buffer and are passed through unchanged."""
+    frame = b'0:"pre-encoded"\n'
+    usage = {"usage": {"promptTokens": 1, "completionTokens": 2}}
+    result = collect(coalesce_chunks(source(["a", "b", frame, "c", usage]), window=LONG_WINDOW))
+    assert result == ["a", "b", frame, "c", usage]
+
+
+def test_coalesce_never_merges_stream_errors():
+    """Test that stream errors are passed through on their own and text that looks like an error stays text."""
+    error = StreamError("the provider failed")
+    tokens = ["Error", ":", " the file", " was not found. Error:", " again", error, "after"]
+    result = collect(coalesce_chunks(source(tokens), window=LONG_WINDOW))
+    assert result == ["Error", ": the file was not found. Error: again", error, "after"]
+
+
+def test_stream_chat_chunks_frames_text_and_errors():
+    """Test that text is sent as 0: frames, including text starting with "Error:", and stream errors as 3: frames."""
+    frames = collect(stream_chat_chunks(source(["Error: not an error", StreamError("boom")])))
+    assert frames[0] == b"0:" + orjson.dumps("Error: not an error") + b"\n"
+    assert frames[1] == b'3:"boom"\n'
+    assert frames[2] == b'e:{"finishReason":"stop","isContinued":false}\nd:{"finishReason":"stop"}\n'
+
+
+def test_stream_chat_chunks_sends_finish_frames_together():
+    """Test that the step finish and finish frames are sent as a single chunk with the usage information."""
+    usage = {"usage": {"promptTokens": 1, "completionTokens": 2}}
+    frames = collect(stream_chat_chunks(source(["hi", usage]), message_id="0" * 36))
+    assert frames[0] == b'f:{"messageId":"' + b"0" * 36 + b'"}\n'
+    assert frames[1] == b'0:"hi"\n'
+    step_finish, finish, end = frames[2].split(b"\n")
+    assert orjson.loads(step_finish[2:]) == {"finishReason": "stop", "usage": usage["usage"], "isContinued": False}
+    assert orjson.loads(finish[2:]) == {"finishReason": "stop", "usage": usage["usage"]}
+    assert end == b""
+    assert len(frames) == 3
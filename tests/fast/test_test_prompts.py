@@ -2,42 +2,24 @@
 Tests for test prompt functionality.
 """
 
-import json
-import os
 import time
 
-import pytest
-from fastapi.testclient import TestClient
+import orjson
 
-from app.main import app
 
-
-@pytest.fixture
-def client():
-    """Test client fixture."""
-    return TestClient(app)
-
-
-@pytest.fixture
-def auth_headers():
-    """Get auth headers for testing."""
-    api_secret = os.environ.get("API_SECRET", "secret_key")
-    return {"Authorization": f"Bearer {api_secret}"}
-
-
-def test_generate_title_with_test_prompt_1(client, auth_headers):
+def test_generate_title_with_test_prompt_1(test_client, auth_headers):
     """Test that 'Test prompt 1' returns 'Test title 1'."""
-    response = client.post("/api/titles/generate", json={"text": "Test prompt 1"}, headers=auth_headers)
+    response = test_client.post("/api/titles/generate", json={"text": "Test prompt 1"}, headers=auth_headers)
 
     assert response.status_code == 200
     assert response.json() == {"text": "Test title 1"}
 
 
-def test_chat_streaming_with_test_prompt_1(client, auth_headers):
+def test_chat_streaming_with_test_prompt_1(test_client, auth_headers):
     """Test that 'Test prompt 1' streams the correct response."""
     start_time = time.time()
 
-    response = client.post(
+    response = test_client.post(
         "/api/chats/test-chat-1/responses",
         json={
             "messages": [{"role": "user", "parts": [{"type": "text", "text": "Test prompt 1"}], "id": "test-msg-1"}],
@@ -49,22 +31,21 @@ def test_chat_streaming_with_test_prompt_1(client, auth_headers):
     assert response.status_code == 200
     assert response.headers["content-type"] == "text/event-stream; charset=utf-8"
 
-    # Parse the streamed response
-    content = response.content.decode("utf-8")
-    lines = content.strip().split("\n")
+    # Parse the streamed response as raw bytes
+    lines = response.content.splitlines()
 
     # Check first chunk is message ID
-    assert lines[0].startswith('f:{"messageId":"')
+    assert lines[0].startswith(b'f:{"messageId":"')
 
     # Check we get the expected tokens
     expected_tokens = ["Test ", "response ", "1"]
     token_lines = []
 
-    for line in lines[1:]:
-        if line.startswith("0:"):
+    # The message ID line is skipped by the prefix check, so no slice of the lines is needed
+    for line in lines:
+        if line.startswith(b"0:"):
             # Extract the token from the JSON
-            token_data = line[2:]  # Remove "0:" prefix
-            token = json.loads(token_data)
+            token = orjson.loads(line[2:])  # Remove "0:" prefix
             token_lines.append(token)
 
     assert token_lines == expected_tokens
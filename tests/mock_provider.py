@@ -0,0 +1,29 @@
+"""
+Canned provider streams, so chat endpoints are exercised without calling the LLM.
+"""
+
+from collections.abc import AsyncGenerator, Callable
+from typing import Any
+
+
+def make_mock_stream_chat_response(
+    chunks: list[str], usage: dict[str, Any]
+) -> Callable[..., AsyncGenerator[str | dict[str, Any], None]]:
+    """
+    Build a replacement for a provider's stream_chat_response.
+
+    Args:
+        chunks: The text chunks to stream.
+        usage: The usage information yielded after the text.
+
+    Returns:
+        An async generator function that accepts and ignores the provider arguments.
+    """
+
+    async def mock_stream_chat_response(*_args, **_kwargs) -> AsyncGenerator[str | dict[str, Any], None]:
+        """Yield the canned chunks followed by usage information."""
+        for chunk in chunks:
+            yield chunk
+        yield usage
+
+    return mock_stream_chat_response
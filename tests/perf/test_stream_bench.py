@@ -0,0 +1,27 @@
+"""
+Benchmarks for the streaming chat endpoint.
+
+The provider is mocked with a fixed token stream, so these measure only the
+route, chunk coalescing and data-stream framing.
+"""
+
+import uuid
+from unittest.mock import patch
+
+from tests.mock_provider import make_mock_stream_chat_response
+
+# Canned provider output: enough tokens to exercise batching and framing on every run
+MOCK_TOKENS = [f"token {i} " for i in range(200)]
+MOCK_USAGE = {"usage": {"promptTokens": 24, "completionTokens": 200}}
+mock_stream_chat_response = make_mock_stream_chat_response(MOCK_TOKENS, MOCK_USAGE)
+
+
+def test_stream_throughput(benchmark, test_client, auth_headers, chat_request_data):
+    """Benchmark a full streamed chat response against a mocked provider."""
+    url = f"/api/chats/{uuid.uuid4()}/responses"
+
+    with patch("app.providers.factory.default_provider.stream_chat_response", new=mock_stream_chat_response):
+        content = benchmark(lambda: test_client.post(url, headers=auth_headers, json=chat_request_data).content)
+
+    assert content.startswith(b'f:{"messageId":"')
+    assert b'd:{"finishReason":"stop"' in content
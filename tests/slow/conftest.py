@@ -0,0 +1,34 @@
+"""
+Shared fixtures for the slow tests.
+
+Each test module shares a single user instead of creating one per test. The test client and
+auth headers come from the root tests/conftest.py.
+"""
+
+import uuid
+
+import pytest
+
+
+@pytest.fixture(scope="module")
+def user_id(test_client, auth_headers):
+    """Create one user per test module and return its ID."""
+    email = f"test-{uuid.uuid4()}@example.com"
+    response = test_client.post(
+        "/api/users", json={"email": email, "passwordHash": "test-password-hash"}, headers=auth_headers
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+@pytest.fixture
+def fresh_chat(test_client, auth_headers, user_id):
+    """Create an empty chat owned by the module user and return its ID."""
+    chat_id = str(uuid.uuid4())
+    response = test_client.post(
+        "/api/chats",
+        json={"id": chat_id, "userId": user_id, "title": "Test Chat", "visibility": "private"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 201
+    return chat_id
@@ -4,38 +4,27 @@ Tests for chat operations.
 This module tests chat CRUD operations, visibility updates, and related error scenarios.
 """
 
-import json
-import os
 import uuid
+from collections import deque
+from unittest.mock import patch
 
+import orjson
 import pytest
-from fastapi.testclient import TestClient
 
-from app.main import app
+from tests.mock_provider import make_mock_stream_chat_response
 
-
-@pytest.fixture
-def test_client():
-    """Test client fixture."""
-    return TestClient(app)
+# Canned provider output, so the endpoint is exercised without calling the LLM
+MOCK_RESPONSE_CHUNKS = ["I'm doing well, ", "thank you for asking! ", "How can I help you today?"]
+MOCK_USAGE = {"usage": {"promptTokens": 24, "completionTokens": 12}}
+mock_stream_chat_response = make_mock_stream_chat_response(MOCK_RESPONSE_CHUNKS, MOCK_USAGE)
 
 
-@pytest.fixture
-def auth_headers():
-    """Get the auth headers."""
-    api_secret = os.environ.get("API_SECRET", "secret_key")
-    return {"Authorization": f"Bearer {api_secret}"}
-
-
-@pytest.fixture
-def chat_request_data():
-    """Get chat request data."""
-    return {
-        "messages": [
-            {"role": "user", "parts": [{"type": "text", "text": "Hello, how are you today?"}], "id": str(uuid.uuid4())}
-        ],
-        "userId": "test-user",
-    }
+def iter_frames(response):
+    """Yield each newline-terminated frame of a streamed response as raw bytes."""
+    pending = b""
+    for data in response.iter_bytes():
+        *frames, pending = (pending + data).split(b"\n")
+        yield from frames
 
 
 @pytest.fixture
@@ -48,56 +37,60 @@ def test_chat_endpoint_no_auth(test_client, chat_request_data, chat_id):
     """Test chat endpoint without authentication."""
     response = test_client.post(f"/api/chats/{chat_id}/responses", json=chat_request_data)
     assert response.status_code == 401
-    assert "message" in response.json()
-    assert "Invalid or missing API key" in response.json()["message"]
+    body = response.json()
+    assert "message" in body
+    assert "Invalid or missing API key" in body["message"]
 
 
 def test_chat_endpoint_success(test_client, auth_headers, chat_request_data, chat_id):
-    """Test chat endpoint with successful response (slow test - makes API call)."""
-    response = test_client.post(f"/api/chats/{chat_id}/responses", headers=auth_headers, json=chat_request_data)
-
-    assert response.status_code == 200
-    assert "text/event-stream" in response.headers["content-type"]
-
-    # Read the response content to verify format
-    content = response.content.decode("utf-8")
-
-    # Check the streaming format
-    chunks = content.split("\n")
-
-    # Check for the first chunk with message ID
-    first_chunk = chunks[0]
-    assert first_chunk.startswith('f:{"messageId":"')
-    assert first_chunk.endswith('"}')
-
-    # Verify messageId format (should be UUID)
-    message_id_data = json.loads(first_chunk.replace("f:", ""))
-    assert "messageId" in message_id_data
-    assert len(message_id_data["messageId"]) == 36  # UUID length
-
-    # Check that normal chunks are properly formatted
-    # Start from index 1 to skip the first message ID chunk
-    for chunk in chunks[1:-3]:  # Exclude the first chunk, last 2 chunks and the empty chunk after split
-        assert chunk.startswith('0:"')
+    """Test chat endpoint with successful response, using a mocked provider stream."""
+    # Mock the default_provider.stream_chat_response method to avoid making real API calls,
+    # and check each frame as it arrives instead of buffering the whole body
+    with (
+        patch("app.providers.factory.default_provider.stream_chat_response", new=mock_stream_chat_response),
+        test_client.stream(
+            "POST", f"/api/chats/{chat_id}/responses", headers=auth_headers, json=chat_request_data
+        ) as response,
+    ):
+        assert response.status_code == 200
+        assert "text/event-stream" in response.headers["content-type"]
+
+        chunks = iter_frames(response)
+
+        # Check for the first chunk with message ID
+        first_chunk = next(chunks)
+        assert first_chunk.startswith(b'f:{"messageId":"')
+        assert first_chunk.endswith(b'"}')
+
+        # Verify messageId format (should be UUID)
+        message_id_data = orjson.loads(first_chunk[2:])
+        assert "messageId" in message_id_data
+        assert len(message_id_data["messageId"]) == 36  # UUID length
+
+        # Check that normal chunks are properly formatted, holding back the last 2 chunks (the finish chunks)
+        tail = deque(maxlen=2)
+        for chunk in chunks:
+            if len(tail) == 2:
+                assert tail[0].startswith(b'0:"')
+            tail.append(chunk)
 
     # check the step finish chunk
-    step_finish_chunk = chunks[-3]
-    assert step_finish_chunk.startswith("e:")
-    step_finish_data = json.loads(step_finish_chunk.replace("e:", ""))
+    step_finish_chunk, finish_chunk = tail
+    assert step_finish_chunk.startswith(b"e:")
+    step_finish_data = orjson.loads(step_finish_chunk[2:])
     assert "finishReason" in step_finish_data
     assert "usage" in step_finish_data
     assert "isContinued" in step_finish_data
 
     # Check for the completion message with usage information
-    finish_chunk = chunks[-2]
-    assert "finishReason" in finish_chunk
+    assert b"finishReason" in finish_chunk
 
     # Check for usage information in the completion message
     # The actual usage information may vary, but tokens should be meaningful
-    assert "usage" in finish_chunk
+    assert b"usage" in finish_chunk
 
     # Convert JSON string to dict to check token values
-    finish_data = json.loads(finish_chunk.replace("d:", ""))
+    finish_data = orjson.loads(finish_chunk[2:])
 
     # Check that token counts are present and have reasonable values
     assert "promptTokens" in finish_data["usage"]
@@ -265,15 +258,6 @@ def test_chat_constraint_scenarios(test_client, auth_headers):
     )
     assert create_chat_response.status_code == 201
 
-    # Test extremely long strings
-    very_long_title = "x" * 10000
-    response = test_client.post(
-        "/api/chats",
-        json={"id": str(uuid.uuid4()), "userId": user_id, "title": very_long_title, "visibility": "public"},
-        headers=auth_headers,
-    )
-    assert response.status_code == 201
-
     # Test empty strings where they shouldn't be allowed
     response = test_client.post(
         "/api/chats",
@@ -5,52 +5,13 @@ This module tests message CRUD operations, deletion by timestamp,
 and related error scenarios.
 """
 
-import os
 import uuid
 from datetime import UTC, datetime, timedelta
 
-import pytest
-from fastapi.testclient import TestClient
 
-from app.main import app
-
-
-@pytest.fixture
-def test_client():
-    """Test client fixture."""
-    return TestClient(app)
-
-
-@pytest.fixture
-def auth_headers():
-    """Get the auth headers."""
-    api_secret = os.environ.get("API_SECRET", "secret_key")
-    return {"Authorization": f"Bearer {api_secret}"}
-
-
-def test_create_message_and_verify_in_chat_and_count(test_client, auth_headers):
+def test_create_message_and_verify_in_chat_and_count(test_client, auth_headers, user_id, fresh_chat):
     """Test creating a message and verifying it appears in chat messages and user message count."""
-    # First, create a user
-    email = f"test-{uuid.uuid4()}@example.com"
-    password_hash = "test-password-hash"
-
-    user_response = test_client.post(
-        "/api/users", json={"email": email, "passwordHash": password_hash}, headers=auth_headers
-    )
-    assert user_response.status_code == 201
-    user = user_response.json()
-    user_id = user["id"]
-
-    # Create a chat for this user
-    chat_id = str(uuid.uuid4())
-    chat_title = "Test Chat for Messages"
-
-    chat_response = test_client.post(
-        "/api/chats",
-        json={"id": chat_id, "userId": user_id, "title": chat_title, "visibility": "private"},
-        headers=auth_headers,
-    )
-    assert chat_response.status_code == 201
+    chat_id = fresh_chat
 
     # Check initial message count (should be 0)
     initial_count_response = test_client.get(f"/api/users/{user_id}/message-count", headers=auth_headers)
@@ -106,41 +67,23 @@ def test_create_message_and_verify_in_chat_and_count(test_client, auth_headers):
     assert final_count == initial_count + 1
 
 
-def test_delete_messages_after_timestamp(test_client, auth_headers):
+def test_delete_messages_after_timestamp(test_client, auth_headers, user_id, fresh_chat):
     """Test creating messages at different times and deleting messages after a specific timestamp."""
-    # First, create a user
-    email = f"test-{uuid.uuid4()}@example.com"
-    password_hash = "test-password-hash"
-
-    user_response = test_client.post(
-        "/api/users", json={"email": email, "passwordHash": password_hash}, headers=auth_headers
-    )
-    assert user_response.status_code == 201
-    user = user_response.json()
-    user_id = user["id"]
-
-    # Create a chat for this user
-    chat_id = str(uuid.uuid4())
-    chat_title = "Test Chat for Message Deletion"
+    chat_id = fresh_chat
 
-    chat_response = test_client.post(
-        "/api/chats",
-        json={"id": chat_id, "userId": user_id, "title": chat_title, "visibility": "private"},
-        headers=auth_headers,
-    )
-    assert chat_response.status_code == 201
+    # Create messages at different timestamps, all offset from a single anchor
+    now = datetime.now(UTC)
 
-    # Create messages at different timestamps
     # Create first message (earlier timestamp)
-    early_time = datetime.now(UTC) - timedelta(hours=2)
+    early_time = now - timedelta(hours=2)
     early_message_id = str(uuid.uuid4())
 
     # Create second message (middle timestamp)
-    middle_time = datetime.now(UTC) - timedelta(hours=1)
+    middle_time = now - timedelta(hours=1)
     middle_message_id = str(uuid.uuid4())
 
     # Create third message (later timestamp)
-    late_time = datetime.now(UTC)
+    late_time = now
     late_message_id = str(uuid.uuid4())
 
     messages_data = [
@@ -178,12 +121,6 @@ def test_delete_messages_after_timestamp(test_client, auth_headers):
     )
     assert save_messages_response.status_code == 201
 
-    # Verify all 3 messages exist
-    initial_messages_response = test_client.get(f"/api/chats/{chat_id}/messages", headers=auth_headers)
-    assert initial_messages_response.status_code == 200
-    initial_messages = initial_messages_response.json()
-    assert len(initial_messages) == 3
-
     # Delete messages after the middle timestamp
     # This should delete the middle and late messages, keeping only the early one
     cutoff_timestamp = middle_time.isoformat()
@@ -213,17 +150,21 @@ def test_delete_messages_after_timestamp(test_client, auth_headers):
 def test_invalid_data_save_messages(test_client, auth_headers):
     """Test saving messages with invalid data."""
     chat_id = str(uuid.uuid4())
+    created_at = datetime.now(UTC).isoformat()
 
     # Invalid message format
     response = test_client.post(
         f"/api/chats/{chat_id}/messages",
         json={
-            "id": "valid-user-id",
+            "userId": "valid-user-id",
             "messages": [
                 {
+                    "chatId": chat_id,
+                    "createdAt": created_at,
                     "role": "invalid_role",  # Should be user or assistant
                     "parts": [{"type": "text", "text": "Test message"}],
                     "attachments": [],
+                    "id": str(uuid.uuid4()),
                 }
             ],
         },
@@ -235,12 +176,15 @@ def test_invalid_data_save_messages(test_client, auth_headers):
     response = test_client.post(
         f"/api/chats/{chat_id}/messages",
         json={
-            "id": "valid-user-id",
+            "userId": "valid-user-id",
             "messages": [
                 {
+                    "chatId": chat_id,
+                    "createdAt": created_at,
                     "role": "user",
                     # Missing parts field
                     "attachments": [],
+                    "id": str(uuid.uuid4()),
                 }
             ],
         },
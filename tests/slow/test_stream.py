@@ -4,51 +4,13 @@ Tests for stream operations.
 This module tests stream creation, retrieval, and related error scenarios.
 """
 
-import os
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 
-import pytest
-from fastapi.testclient import TestClient
 
-from app.main import app
-
-
-@pytest.fixture
-def test_client():
-    """Test client fixture."""
-    return TestClient(app)
-
-
-@pytest.fixture
-def auth_headers():
-    """Get the auth headers."""
-    api_secret = os.environ.get("API_SECRET", "secret_key")
-    return {"Authorization": f"Bearer {api_secret}"}
-
-
-def test_create_and_get_streams(test_client, auth_headers):
+def test_create_and_get_streams(test_client, auth_headers, fresh_chat):
     """Test creating a stream and verifying it appears in chat streams list."""
-    # First, create a user
-    email = f"test-{uuid.uuid4()}@example.com"
-    password_hash = "test-password-hash"
-
-    user_response = test_client.post(
-        "/api/users", json={"email": email, "passwordHash": password_hash}, headers=auth_headers
-    )
-    assert user_response.status_code == 201
-    user = user_response.json()
-    user_id = user["id"]
-
-    # Create a chat for this user
-    chat_id = str(uuid.uuid4())
-    chat_title = "Test Chat for Streams"
-
-    chat_response = test_client.post(
-        "/api/chats",
-        json={"id": chat_id, "userId": user_id, "title": chat_title, "visibility": "private"},
-        headers=auth_headers,
-    )
-    assert chat_response.status_code == 201
+    chat_id = fresh_chat
 
     # Check initial streams (should be empty)
     initial_streams_response = test_client.get(f"/api/chats/{chat_id}/streams", headers=auth_headers)
@@ -96,50 +58,33 @@ def test_create_and_get_streams(test_client, auth_headers):
     assert stream_id_2 in multi_streams["ids"]
 
 
-def test_create_multiple_streams_different_chats(test_client, auth_headers):
+def test_create_multiple_streams_different_chats(test_client, auth_headers, user_id):
     """Test creating streams in different chats."""
-    # Create a user
-    email = f"test-{uuid.uuid4()}@example.com"
-    password_hash = "test-password-hash"
 
-    user_response = test_client.post(
-        "/api/users", json={"email": email, "passwordHash": password_hash}, headers=auth_headers
-    )
-    assert user_response.status_code == 201
-    user = user_response.json()
-    user_id = user["id"]
-
-    # Create two different chats
-    chat_id_1 = str(uuid.uuid4())
-    chat_id_2 = str(uuid.uuid4())
-
-    for chat_id in [chat_id_1, chat_id_2]:
-        chat_response = test_client.post(
+    def create_chat(chat_id):
+        return test_client.post(
             "/api/chats",
             json={"id": chat_id, "userId": user_id, "title": f"Chat {chat_id}", "visibility": "private"},
             headers=auth_headers,
         )
-        assert chat_response.status_code == 201
 
-    # Create streams in each chat
+    def create_stream(chat_id, stream_id):
+        return test_client.post(f"/api/chats/{chat_id}/streams", json={"id": stream_id}, headers=auth_headers)
+
+    chat_id_1 = str(uuid.uuid4())
+    chat_id_2 = str(uuid.uuid4())
     stream_id_1 = str(uuid.uuid4())
     stream_id_2 = str(uuid.uuid4())
 
-    # Stream in first chat
-    response_1 = test_client.post(
-        f"/api/chats/{chat_id_1}/streams",
-        json={"id": stream_id_1},
-        headers=auth_headers,
-    )
-    assert response_1.status_code == 201
+    # The two chats, and then the two streams, are independent, so each pair is sent concurrently
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        # Create two different chats
+        for chat_response in executor.map(create_chat, [chat_id_1, chat_id_2]):
+            assert chat_response.status_code == 201
 
-    # Stream in second chat
-    response_2 = test_client.post(
-        f"/api/chats/{chat_id_2}/streams",
-        json={"id": stream_id_2},
-        headers=auth_headers,
-    )
-    assert response_2.status_code == 201
+        # Create a stream in each chat
+        for stream_response in executor.map(create_stream, [chat_id_1, chat_id_2], [stream_id_1, stream_id_2]):
+            assert stream_response.status_code == 201
 
     # Verify each chat has only its own stream
     streams_1_response = test_client.get(f"/api/chats/{chat_id_1}/streams", headers=auth_headers)
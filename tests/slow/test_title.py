@@ -2,46 +2,38 @@
 Tests for the generate_title endpoint.
 """
 
-import os
+import re
+from unittest.mock import patch
 
-import pytest
-from fastapi.testclient import TestClient
-
-from app.main import app
-
-
-@pytest.fixture
-def test_client():
-    """Test client fixture."""
-    return TestClient(app)
-
-
-@pytest.fixture
-def auth_headers():
-    """Get the auth headers."""
-    api_secret = os.environ.get("API_SECRET", "secret_key")
-    return {"Authorization": f"Bearer {api_secret}"}
+# Keywords from the test message, at least one of which should appear in its title
+TITLE_KEYWORD_PATTERN = re.compile(r"python|development|environment|project", re.IGNORECASE)
 
 
 def test_generate_title_empty_message(test_client, auth_headers):
     """Test generate_title endpoint with empty message."""
     response = test_client.post("/api/titles/generate", headers=auth_headers, json={"text": ""})
     assert response.status_code == 400
-    assert "detail" in response.json()
-    assert "empty" in response.json()["detail"].lower()
+    body = response.json()
+    assert "detail" in body
+    assert "empty" in body["detail"].lower()
 
 
 def test_generate_title_success(test_client, auth_headers):
-    """Test generate_title endpoint with successful response (slow test - makes API call)."""
+    """Test generate_title endpoint with successful response, using a mocked provider."""
     test_message = "I need help setting up a Python development environment for a new web project."
 
-    response = test_client.post("/api/titles/generate", headers=auth_headers, json={"text": test_message})
+    # Mock the default_provider.get_response method to avoid making real API calls
+    with patch(
+        "app.providers.factory.default_provider.get_response", return_value="Python Development Environment Setup"
+    ):
+        response = test_client.post("/api/titles/generate", headers=auth_headers, json={"text": test_message})
 
     assert response.status_code == 200
-    assert "text" in response.json()
+    body = response.json()
+    assert "text" in body
 
     # Check that the title is not empty and not too long
-    title = response.json()["text"]
+    title = body["text"]
     assert title
     assert len(title) <= 80
 
@@ -51,4 +43,4 @@ def test_generate_title_success(test_client, auth_headers):
     assert ":" not in title
 
     # Check that the title is relevant to the message
-    assert any(keyword.lower() in title.lower() for keyword in ["Python", "development", "environment", "project"])
+    assert TITLE_KEYWORD_PATTERN.search(title)
@@ -5,58 +5,33 @@ This module tests user CRUD operations, OAuth functionality,
 and related error scenarios.
 """
 
-import json
-import os
 import uuid
 
 import pytest
-from fastapi.testclient import TestClient
 
-from app.main import app
+TEST_PASSWORD_HASH = "test-password-hash"
 
 
-@pytest.fixture
-def test_client():
-    """Test client fixture."""
-    return TestClient(app)
+def unique_email():
+    """Generate an email address no other test uses."""
+    return f"test-{uuid.uuid4()}@example.com"
 
 
-@pytest.fixture
-def auth_headers():
-    """Get the auth headers."""
-    api_secret = os.environ.get("API_SECRET", "secret_key")
-    return {"Authorization": f"Bearer {api_secret}"}
+def oauth_provider_data():
+    """Generate OAuth provider data with a unique provider account ID."""
+    return {"provider": "google", "providerAccountId": str(uuid.uuid4())}
 
 
-@pytest.fixture
-def test_data_generator():
-    """Test data generator fixture."""
+def unique_id():
+    """Generate a unique ID."""
+    return str(uuid.uuid4())
 
-    class TestDataGenerator:
-        @staticmethod
-        def unique_email():
-            return f"test-{uuid.uuid4()}@example.com"
 
-        @staticmethod
-        def test_password_hash():
-            return "test-password-hash"
-
-        @staticmethod
-        def oauth_provider_data():
-            return {"provider": "google", "providerAccountId": str(uuid.uuid4())}
-
-        @staticmethod
-        def unique_id():
-            return str(uuid.uuid4())
-
-    return TestDataGenerator()
-
-
-def test_create_and_get_user_with_password(test_client, test_data_generator, auth_headers):
+def test_create_and_get_user_with_password(test_client, auth_headers):
     """Test creating a user with email/password and retrieving it."""
     # Generate test data
-    email = test_data_generator.unique_email()
-    password_hash = test_data_generator.test_password_hash()
+    email = unique_email()
+    password_hash = TEST_PASSWORD_HASH
 
     # Create user via POST /api/users
     create_response = test_client.post(
@@ -93,7 +68,6 @@ def test_create_and_get_guest_user(test_client, auth_headers):
     # Verify creation response
     assert create_response.status_code == 201
     created_user = create_response.json()
-    print(f"Created user: {json.dumps(created_user, indent=4)}")
     assert created_user["source"] == "guest"
     assert "id" in created_user
     assert "email" in created_user
@@ -108,7 +82,6 @@ def test_create_and_get_guest_user(test_client, auth_headers):
     # Verify retrieval response
     assert get_response.status_code == 200
     retrieved_user = get_response.json()
-    print(f"Retrieved user: {json.dumps(retrieved_user, indent=4)}")
     assert retrieved_user["email"] == guest_email
     assert retrieved_user["source"] == "guest"
     assert retrieved_user["id"] == created_user["id"]
@@ -116,11 +89,11 @@ def test_create_and_get_guest_user(test_client, auth_headers):
     assert "passwordHash" not in retrieved_user
 
 
-def test_create_and_get_oauth_user(test_client, test_data_generator, auth_headers):
+def test_create_and_get_oauth_user(test_client, auth_headers):
     """Test creating an OAuth user and retrieving it."""
     # Generate test data
-    email = test_data_generator.unique_email()
-    oauth_data = test_data_generator.oauth_provider_data()
+    email = unique_email()
+    oauth_data = oauth_provider_data()
 
     # Create OAuth user via POST /api/users/oauth
     create_response = test_client.post(
@@ -155,11 +128,11 @@ def test_create_and_get_oauth_user(test_client, test_data_generator, auth_header
     assert "passwordHash" not in retrieved_user
 
 
-def test_create_chat_appears_in_user_chats(test_client, test_data_generator, auth_headers):
+def test_create_chat_appears_in_user_chats(test_client, auth_headers):
     """Test creating a chat and verifying it appears in user's chat list."""
     # First, create a user
-    email = test_data_generator.unique_email()
-    password_hash = test_data_generator.test_password_hash()
+    email = unique_email()
+    password_hash = TEST_PASSWORD_HASH
 
     user_response = test_client.post(
         "/api/users", json={"email": email, "passwordHash": password_hash}, headers=auth_headers
@@ -169,7 +142,7 @@ def test_create_chat_appears_in_user_chats(test_client, test_data_generator, aut
     user_id = user["id"]
 
     # Create a chat for this user
-    chat_id = test_data_generator.unique_id()
+    chat_id = unique_id()
     chat_title = "Test Chat"
 
     chat_response = test_client.post(
@@ -204,19 +177,19 @@ def test_create_chat_appears_in_user_chats(test_client, test_data_generator, aut
 # Error handling tests for user operations
 
 
-def test_get_nonexistent_user_returns_404(test_client, test_data_generator, auth_headers):
+def test_get_nonexistent_user_returns_404(test_client, auth_headers):
     """Test that getting a non-existent user returns 404."""
-    nonexistent_email = test_data_generator.unique_email()
+    nonexistent_email = unique_email()
 
     response = test_client.get(f"/api/users/{nonexistent_email}", headers=auth_headers)
     assert response.status_code == 404
     assert "not found" in response.json()["detail"].lower()
 
 
-def test_create_user_with_duplicate_email_handling(test_client, test_data_generator, auth_headers):
+def test_create_user_with_duplicate_email_handling(test_client, auth_headers):
     """Test creating users with duplicate emails (should handle gracefully)."""
-    email = test_data_generator.unique_email()
-    password_hash = test_data_generator.test_password_hash()
+    email = unique_email()
+    password_hash = TEST_PASSWORD_HASH
 
     # Create first user
     first_response = test_client.post(
@@ -234,57 +207,30 @@ def test_create_user_with_duplicate_email_handling(test_client, test_data_genera
     assert second_response.status_code == 409
 
 
-def test_invalid_user_creation_data(test_client, auth_headers):
+@pytest.mark.parametrize(
+    "payload",
+    [
+        pytest.param({}, id="missing-fields"),
+        pytest.param({"email": 123, "passwordHash": "valid-hash"}, id="email-not-string"),
+        pytest.param({"email": "", "passwordHash": "valid-hash"}, id="empty-email"),
+    ],
+)
+def test_invalid_user_creation_data(test_client, auth_headers, payload):
     """Test user creation with invalid data."""
-    # Missing required fields
-    response = test_client.post(
-        "/api/users",
-        json={},
-        headers=auth_headers,
-    )
+    response = test_client.post("/api/users", json=payload, headers=auth_headers)
     assert response.status_code == 422  # Unprocessable Entity
 
-    # Invalid field types
-    response = test_client.post(
-        "/api/users",
-        json={
-            "email": 123,  # Should be string
-            "passwordHash": "valid-hash",
-        },
-        headers=auth_headers,
-    )
-    assert response.status_code == 422
 
-    # Empty email string
-    response = test_client.post(
-        "/api/users",
-        json={
-            "email": "",  # Empty string
-            "passwordHash": "valid-hash",
-        },
-        headers=auth_headers,
-    )
-    assert response.status_code == 422
-
-
-def test_invalid_oauth_user_creation_data(test_client, auth_headers):
+@pytest.mark.parametrize(
+    "payload",
+    [
+        pytest.param({"email": "test@example.com"}, id="missing-provider-fields"),
+        pytest.param(
+            {"email": "test@example.com", "provider": "", "providerAccountId": "valid-id"}, id="empty-provider"
+        ),
+    ],
+)
+def test_invalid_oauth_user_creation_data(test_client, auth_headers, payload):
     """Test OAuth user creation with invalid data."""
-    # Missing required provider fields
-    response = test_client.post(
-        "/api/users/oauth",
-        json={"email": "test@example.com"},  # Missing provider and providerAccountId
-        headers=auth_headers,
-    )
-    assert response.status_code == 422
-
-    # Empty provider string
-    response = test_client.post(
-        "/api/users/oauth",
-        json={
-            "email": "test@example.com",
-            "provider": "",  # Empty string
-            "providerAccountId": "valid-id",
-        },
-        headers=auth_headers,
-    )
+    response = test_client.post("/api/users/oauth", json=payload, headers=auth_headers)
     assert response.status_code == 422
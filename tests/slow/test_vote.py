@@ -4,61 +4,22 @@ Tests for vote operations.
 This module tests message voting functionality and related error scenarios.
 """
 
-import os
 import uuid
 from datetime import UTC, datetime
 
 import pytest
-from fastapi.testclient import TestClient
-
-from app.main import app
-
-
-@pytest.fixture
-def test_client():
-    """Test client fixture."""
-    return TestClient(app)
 
 
 @pytest.fixture
-def auth_headers():
-    """Get the auth headers."""
-    api_secret = os.environ.get("API_SECRET", "secret_key")
-    return {"Authorization": f"Bearer {api_secret}"}
-
-
-def test_vote_on_message(test_client, auth_headers):
-    """Test creating a message and voting on it, verifying vote appears in chat votes."""
-    # First, create a user
-    email = f"test-{uuid.uuid4()}@example.com"
-    password_hash = "test-password-hash"
-
-    user_response = test_client.post(
-        "/api/users", json={"email": email, "passwordHash": password_hash}, headers=auth_headers
-    )
-    assert user_response.status_code == 201
-    user = user_response.json()
-    user_id = user["id"]
-
-    # Create a chat for this user
-    chat_id = str(uuid.uuid4())
-    chat_title = "Test Chat for Voting"
-
-    chat_response = test_client.post(
-        "/api/chats",
-        json={"id": chat_id, "userId": user_id, "title": chat_title, "visibility": "private"},
-        headers=auth_headers,
-    )
-    assert chat_response.status_code == 201
-
-    # Create and save a message to vote on
+def votable_message(test_client, auth_headers, user_id, fresh_chat):
+    """Save an assistant message in a fresh chat and return the chat and message IDs."""
+    chat_id = fresh_chat
     message_id = str(uuid.uuid4())
-    created_at = datetime.now(UTC).isoformat()
 
     messages_data = [
         {
             "chatId": chat_id,
-            "createdAt": created_at,
+            "createdAt": datetime.now(UTC).isoformat(),
             "role": "assistant",
             "parts": [{"type": "text", "text": "This is a message to vote on"}],
             "attachments": [],
@@ -66,13 +27,18 @@ def test_vote_on_message(test_client, auth_headers):
         }
     ]
 
-    # Save messages via POST /api/chats/{chat_id}/messages
     save_messages_response = test_client.post(
         f"/api/chats/{chat_id}/messages",
         json={"userId": user_id, "messages": messages_data},
         headers=auth_headers,
     )
     assert save_messages_response.status_code == 201
+    return chat_id, message_id
+
+
+def test_vote_on_message(test_client, auth_headers, votable_message):
+    """Test voting on a message, verifying vote appears in chat votes."""
+    chat_id, message_id = votable_message
 
     # Check initial votes (should be empty)
     initial_votes_response = test_client.get(f"/api/chats/{chat_id}/votes", headers=auth_headers)
@@ -100,52 +66,9 @@ def test_vote_on_message(test_client, auth_headers):
     assert vote["isUpvoted"]
 
 
-def test_vote_down_on_message(test_client, auth_headers):
+def test_vote_down_on_message(test_client, auth_headers, votable_message):
     """Test voting down on a message."""
-    # First, create a user
-    email = f"test-{uuid.uuid4()}@example.com"
-    password_hash = "test-password-hash"
-
-    user_response = test_client.post(
-        "/api/users", json={"email": email, "passwordHash": password_hash}, headers=auth_headers
-    )
-    assert user_response.status_code == 201
-    user = user_response.json()
-    user_id = user["id"]
-
-    # Create a chat for this user
-    chat_id = str(uuid.uuid4())
-    chat_title = "Test Chat for Down Voting"
-
-    chat_response = test_client.post(
-        "/api/chats",
-        json={"id": chat_id, "userId": user_id, "title": chat_title, "visibility": "private"},
-        headers=auth_headers,
-    )
-    assert chat_response.status_code == 201
-
-    # Create and save a message to vote on
-    message_id = str(uuid.uuid4())
-    created_at = datetime.now(UTC).isoformat()
-
-    messages_data = [
-        {
-            "chatId": chat_id,
-            "createdAt": created_at,
-            "role": "assistant",
-            "parts": [{"type": "text", "text": "This is a message to vote down"}],
-            "attachments": [],
-            "id": message_id,
-        }
-    ]
-
-    # Save messages
-    save_messages_response = test_client.post(
-        f"/api/chats/{chat_id}/messages",
-        json={"userId": user_id, "messages": messages_data},
-        headers=auth_headers,
-    )
-    assert save_messages_response.status_code == 201
+    chat_id, message_id = votable_message
 
     # Vote down on the message
     vote_response = test_client.post(